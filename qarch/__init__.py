@@ -181,6 +181,8 @@ class QARCH_PT_settings(bpy.types.Panel):
         col.use_property_split = True
         col.use_property_decorate = False
         col.prop(context.scene.qarch_settings, "libpath")
+        col.prop(context.scene.qarch_settings, "fill_cache_size")
+        col.operator("qarch.clear_fill_cache")
 
 
 classes = (QARCH_PT_mesh_tools, QARCH_PT_material_tools, QARCH_PT_settings)
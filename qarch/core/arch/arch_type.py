@@ -15,8 +15,10 @@ from ...utils import (
     calc_face_dimensions,
     add_faces_to_map,
 )
+from ..fill import cached_fill
 
 
+@cached_fill(lambda prop: prop.arch)
 def fill_arch(arch, prop):
     """ Fill arch
     """
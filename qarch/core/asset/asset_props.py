@@ -54,6 +54,15 @@ class AssetProperty(bpy.types.PropertyGroup):
     asset: bpy.props.EnumProperty(name="Asset", items=get_assets)
     track: bpy.props.EnumProperty(name="Track", items=[('X','X','X'),('Y','Y','Y'),('Z','Z','Z'),('-X','-X','-X'),('-Y','-Y','-Y'),('-Z','-Z','-Z')], default="Z")
     up: bpy.props.EnumProperty(name="Up", items=[('X','X','X'),('Y','Y','Y'),('Z','Z','Z')], default="Y")
+    placement: bpy.props.EnumProperty(
+        name="Placement",
+        items=[
+            ('LINKED', 'Linked', 'Object copies sharing the mesh data of the asset'),
+            ('COLLECTION', 'Instance', 'Empties instancing a collection holding the asset'),
+        ],
+        default="LINKED",
+        description="How the asset is placed on each face",
+    )
 
     def init(self):
         self.offset = (0,0,0)
@@ -79,4 +88,8 @@ class AssetProperty(bpy.types.PropertyGroup):
 
         row = layout.row(align=True)
         row.label(text="Up")
-        row.prop(self, "up", expand=True)
\ No newline at end of file
+        row.prop(self, "up", expand=True)
+
+        row = layout.row(align=True)
+        row.label(text="Placement")
+        row.prop(self, "placement", expand=True)
\ No newline at end of file
@@ -9,7 +9,8 @@ from ...utils import (
     local_xyz,
     align_obj,
     vec_equal,
-    import_blend,
+    blend_cache,
+    collection_instance,
 )
 
 from ..validations import validate, some_selection
@@ -23,15 +24,20 @@ def add_asset(context, props):
     with managed_bmesh_edit(context.edit_object) as bm:
         faces = [f for f in bm.faces if f.select]
         deselect(faces)
-        for f in faces:
-            if props.asset_type and props.category and props.asset:
-                add_object(f, props.offset, context.scene.qarch_settings.libpath, props.asset_type, props.category, props.asset, props.track, props.up)
+        if props.asset_type and props.category and props.asset:
+            filepath = os.path.join(context.scene.qarch_settings.libpath, props.asset_type, props.category, props.asset + ".blend")
+            for f in faces:
+                add_object(f, props.offset, filepath, props.placement, props.track, props.up)
     return {"FINISHED"}
 
-def add_object(face, offset, libpath, asset_type, category, asset, track, up):
-    filepath = (os.path.join(libpath, asset_type, category, asset + ".blend"))
-
-    objects = import_blend(filepath)
+def add_object(face, offset, filepath, placement, track, up):
+    """ Place the asset at filepath on face, as linked duplicates of its objects or as one
+        instance of a collection holding them. The file is read once per session
+    """
+    if placement == "COLLECTION":
+        objects = [collection_instance(blend_cache.collection(filepath))]
+    else:
+        objects = blend_cache.import_blend(filepath)
 
     if vec_equal(face.normal, Vector((0,0,1))):
         xyz = [Vector((1,0,0)), Vector((0,1,0)), Vector((0,0,1))]
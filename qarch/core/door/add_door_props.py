@@ -11,6 +11,7 @@ class AddDoorProperty(bpy.types.PropertyGroup):
 
     count: CountProperty
     only_hole: BoolProperty(name="Only hole", default=False, description="Only hole. No door/frame")
+    share_meshes: BoolProperty(name="Share Meshes", default=False, description="Link identical doors to one mesh instead of filling each")
     arch: PointerProperty(type=ArchProperty)
     size_offset: PointerProperty(type=SizeOffsetProperty)
     frame: PointerProperty(type=FrameProperty)
@@ -35,6 +36,7 @@ class AddDoorProperty(bpy.types.PropertyGroup):
 
         col = layout.column(align=True)
         col.prop(self, "only_hole")
+        col.prop(self, "share_meshes")
 
         if not self.only_hole:
 
@@ -2,7 +2,7 @@ import bpy, bmesh
 import os
 from pathlib import Path
 from ..generic import clamp_count
-from ..fill import fill_face
+from ..fill import fill_face, cached_fill
 from ..arch import fill_arch
 
 from ...utils import (
@@ -19,11 +19,13 @@ from ...utils import (
     extrude_face_region,
     managed_bmesh,
     managed_bmesh_edit,
+    SharedMeshes,
     get_opposite_face,
+    opposite_face_cache,
     get_relative_offset,
     crash_safe,
     deselect,
-    import_blend,
+    cached_import_blend,
     local_xyz,
     align_obj,
     shrink_face,
@@ -40,7 +42,7 @@ def build_door(context, props):
     """ Create door from context and prop, with validations. Intented to be called directly from operator.
     """
     verify_facemaps_for_object(context.object)
-    with managed_bmesh_edit(context.edit_object) as bm:
+    with managed_bmesh_edit(context.edit_object) as bm, opposite_face_cache(bm):
         faces = [f for f in bm.faces if f.select]
         deselect(faces)
         props.init(
@@ -55,6 +57,7 @@ def build_door(context, props):
 def create_door(bm, faces, prop):
     """Create door from face selection
     """
+    shared_meshes = SharedMeshes(prop.share_meshes)
     for face in faces:
         clamp_count(calc_face_dimensions(face)[0], prop.frame.margin * 2, prop)
         array_faces = subdivide_face_horizontally(bm, face, widths=[prop.size_offset.size.x] * prop.count)
@@ -100,10 +103,11 @@ def create_door(bm, faces, prop):
                         fill_arch(arch, prop)
 
                 for door in doors:
-                    fill_door(door, prop)
+                    shared_meshes.fill(door, fill_door, prop)
     return True
 
 
+@cached_fill(lambda prop: prop.door)
 def fill_door(door, prop):
     """ Fill individual door face
     """
@@ -140,11 +144,11 @@ def add_knobs(door_faces, door_origins, door_thickness, knob_type, flip=False):
     for door_face,door_origin in zip(door_faces,door_origins):
         directory = Path(os.path.dirname(__file__)).parent.parent
         if knob_type == "ROUND":
-            knob_front = import_blend(os.path.join(directory, 'assets', 'knob_round.blend'))[0]
-            knob_back = import_blend(os.path.join(directory, 'assets', 'knob_round.blend'))[0]
+            knob_front = cached_import_blend(os.path.join(directory, 'assets', 'knob_round.blend'))[0]
+            knob_back = cached_import_blend(os.path.join(directory, 'assets', 'knob_round.blend'))[0]
         elif knob_type == "STRAIGHT":
-            knob_front = import_blend(os.path.join(directory, 'assets', 'knob_straight.blend'))[0]
-            knob_back = import_blend(os.path.join(directory, 'assets', 'knob_straight.blend'))[0]
+            knob_front = cached_import_blend(os.path.join(directory, 'assets', 'knob_straight.blend'))[0]
+            knob_back = cached_import_blend(os.path.join(directory, 'assets', 'knob_straight.blend'))[0]
         xyz = local_xyz(door_face)
         door_width,_ = calc_face_dimensions(door_face)
         hinge = "LEFT" if local_xyz(door_face)[0].dot(door_origin-door_face.calc_center_bounds()) < 0 else "RIGHT"
@@ -1,6 +1,7 @@
 import bpy
 from .fill_props import FillBars, FillPanel, FillLouver, FillGlassPanes, FillProperty
-from .fill_types import fill_face, fill_bars
+from .fill_types import fill_face, fill_bars, fill_bars_object
+from .fill_cache import FillCache, fill_cache, cached_fill, clear_fill_cache
 
 classes = (FillBars, FillPanel, FillLouver, FillGlassPanes, FillProperty)
 
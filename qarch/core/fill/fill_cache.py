@@ -0,0 +1,200 @@
+import bpy
+from bpy.app.handlers import persistent
+from functools import wraps
+from collections import OrderedDict
+from mathutils import Matrix, Vector
+
+from ...utils import FaceMap, local_xyz, mesh_from_arrays
+
+
+def prop_key(prop, precision=5):
+    """ Hashable snapshot of the values in a property group and the groups it points to
+    """
+    values = []
+    for p in prop.bl_rna.properties:
+        if p.identifier == "rna_type":
+            continue
+        value = getattr(prop, p.identifier)
+        if p.type == "POINTER":
+            value = None if value is None else prop_key(value, precision)
+        elif p.type == "COLLECTION":
+            value = tuple(prop_key(v, precision) for v in value)
+        elif getattr(p, "is_array", False):
+            value = tuple(value)
+        elif p.type == "FLOAT":
+            value = round(value, precision)
+        values.append((p.identifier, value))
+    return tuple(values)
+
+
+def face_frame(me):
+    """ Matrix taking coords in the local_xyz frame of the only polygon of me, centered on
+        its bounds, to mesh coords. None when me is not a single polygon or the frame is
+        degenerate (horizontal faces)
+    """
+    if len(me.polygons) != 1:
+        return None
+    poly = me.polygons[0]
+    coords = [me.vertices[i].co for i in poly.vertices]
+    center = Vector([(min(c[i] for c in coords) + max(c[i] for c in coords)) / 2 for i in range(3)])
+    frame = Matrix(local_xyz(poly)).transposed().to_4x4()
+    frame.translation = center
+    if abs(frame.determinant()) < 1e-6:
+        return None
+    return frame
+
+
+class FillCache:
+    """ Geometry made by fill functions keyed by the shape of the face they filled and
+        the fill properties
+
+        A fill on a face with the same outline, in the face's own frame, and the same
+        property values as a previous one writes the stored result, transformed to the
+        new face, instead of running the fill again. Least recently used entries are
+        dropped past maxsize; a maxsize of 0 disables the cache
+    """
+
+    def __init__(self, maxsize=128, precision=4):
+        self.maxsize = maxsize
+        self.precision = precision
+        self.hits = self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def resize(self, maxsize):
+        """ Change maxsize, dropping the least recently used entries past it
+        """
+        self.maxsize = maxsize
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def fill(self, obj, fill, key_prop, *args):
+        """ Call fill(obj, *args) on obj holding a single face, or stamp the result of an
+            earlier call with an equal face and key_prop onto it
+        """
+        settings = getattr(bpy.context.scene, "qarch_settings", None)
+        if settings is not None and settings.fill_cache_size != self.maxsize:
+            self.resize(settings.fill_cache_size)
+
+        frame = face_frame(obj.data) if self.maxsize else None
+        if frame is None:
+            return fill(obj, *args)
+
+        to_local = frame.inverted()
+        me = obj.data
+        outline = tuple(
+            round(c, self.precision)
+            for i in me.polygons[0].vertices
+            for c in to_local @ me.vertices[i].co
+        )
+        # -- the fill helpers tell vertical from horizontal edges along the mesh z axis,
+        # -- so the tilt of the face matters as well as its outline
+        tilt = round(me.polygons[0].normal.z, self.precision)
+        base_slots = len(me.materials)
+        key = (fill, outline, tilt, base_slots, prop_key(key_prop))
+        entry = self._entries.get(key)
+        if entry is not None:
+            materials = self._materials(entry)
+            if materials is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                self._stamp(obj, entry, materials, frame)
+                return None
+            # -- a material was renamed or removed, fill the face again
+            del self._entries[key]
+
+        self.misses += 1
+        result = fill(obj, *args)
+        self._store(key, self._record(obj, to_local, base_slots))
+        return result
+
+    def _store(self, key, entry):
+        self._entries[key] = entry
+        self.resize(self.maxsize)
+
+    def _materials(self, entry):
+        """ The materials the fill of entry added, None if one of them no longer exists
+        """
+        materials = []
+        for name in entry[2]:
+            mat = bpy.data.materials.get(name) if name else None
+            if name and mat is None:
+                return None
+            materials.append(mat)
+        return materials
+
+    def _record(self, obj, to_local, base_slots):
+        me = obj.data
+        coords = tuple(c for v in me.vertices for c in to_local @ v.co)
+        polygons = tuple(tuple(p.vertices) for p in me.polygons)
+        # -- the slots the object had before the fill are its own and are not stored
+        materials = tuple(m.name if m else None for m in me.materials[base_slots:])
+        material_indices = tuple(p.material_index for p in me.polygons)
+        facemaps = [0] * len(me.polygons)
+        if bpy.app.version < (4, 0, 0):
+            face_map_names = tuple(fm.name for fm in obj.face_maps)
+            if me.face_maps:
+                me.face_maps[0].data.foreach_get("value", facemaps)
+            else:
+                facemaps = [-1] * len(me.polygons)
+        else:
+            face_map_names = ()
+            layer = me.attributes.get(FaceMap.FACEMAP.name)
+            if layer is not None:
+                layer.data.foreach_get("value", facemaps)
+        return coords, polygons, materials, material_indices, tuple(facemaps), face_map_names
+
+    def _stamp(self, obj, entry, materials, frame):
+        """ Replace the mesh of obj with the geometry of entry placed by frame. The
+            material slots obj already had are kept, the ones the fill added follow
+        """
+        coords, polygons, _, material_indices, facemaps, face_map_names = entry
+        coords = [
+            c
+            for i in range(0, len(coords), 3)
+            for c in frame @ Vector(coords[i:i + 3])
+        ]
+        me = mesh_from_arrays(coords, polygons, list(facemaps))
+        unfilled = obj.data
+        for mat in list(unfilled.materials) + materials:
+            me.materials.append(mat)
+        me.polygons.foreach_set("material_index", material_indices)
+        name = unfilled.name
+        obj.data = me
+        bpy.data.meshes.remove(unfilled)
+        me.name = name
+        # -- face maps belong to the object before 4.0
+        for name in face_map_names:
+            if not obj.face_maps.get(name):
+                obj.face_maps.new(name=name)
+                obj.facemap_materials.add()
+
+
+fill_cache = FillCache()
+
+
+@persistent
+def clear_fill_cache(*args):
+    """ Forget the entries of fill_cache, run from the load_post and undo_post handlers
+    """
+    fill_cache.clear()
+
+
+def cached_fill(key_prop):
+    """ Run the decorated fill(obj, prop) through fill_cache, keyed by key_prop(prop)
+    """
+
+    def decorator(fill):
+        @wraps(fill)
+        def wrapper(obj, prop):
+            return fill_cache.fill(obj, fill, key_prop(prop), prop)
+
+        return wrapper
+
+    return decorator
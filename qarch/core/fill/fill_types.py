@@ -13,6 +13,7 @@ from ...utils import (
     filter_vertical_edges,
     filter_horizontal_edges,
     add_facemaps,
+    managed_bmesh,
     verify_facemaps_for_object,
     edge_to_cylinder,
     duplicate_faces,
@@ -22,6 +23,7 @@ from ...utils import (
     subdivide_face_vertically,
     sort_faces,
 )
+from .fill_cache import cached_fill
 
 
 def fill_face(bm, obj, front_face, back_face, fill_prop):
@@ -128,6 +130,14 @@ def fill_bars(bm, obj, face, prop):
         bmesh.ops.delete(bm, geom=vertical_faces, context="FACES")
 
 
+@cached_fill(lambda prop: prop)
+def fill_bars_object(obj, prop):
+    """ Create bars along the only face of obj
+    """
+    with managed_bmesh(obj) as bm:
+        fill_bars(bm, obj, bm.faces[0], prop)
+
+
 def fill_louver(bm, obj, front_face, back_face, prop):
     """Create louvers from face
     """
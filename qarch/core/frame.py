@@ -21,7 +21,6 @@ from ..utils import (
     get_closest_edges,
     filter_geom,
     boundary_edges,
-    common_faces,
     subdivide_faces,
     clamp,
     extrude_edges,
@@ -253,7 +252,7 @@ def create_multigroup_hole(bm, face, size, offset, components, width_ratio, fram
     """ Use properties from SizeOffset to subdivide face into regular quads
     """
     xyz = local_xyz(face)
-    opposite_face = get_opposite_face(face, [f for f in bm.faces if f!=face])
+    opposite_face = get_opposite_face(face, bm.faces)
     relative_offset = Vector(get_relative_offset(face, opposite_face))
     wall_thickness = abs(face.normal.dot(face.calc_center_bounds()-opposite_face.calc_center_bounds())) if equal(relative_offset.y, 0) else float("inf")
     wall_width,_ = calc_face_dimensions(face)
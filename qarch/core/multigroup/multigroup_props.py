@@ -18,6 +18,7 @@ class MultigroupProperty(bpy.types.PropertyGroup):
 
     count: CountProperty
     only_hole: BoolProperty(name="Only hole", default=False, description="Only hole. No door/window/frame")
+    share_meshes: BoolProperty(name="Share Meshes", default=False, description="Link identical doors and windows to one mesh instead of filling each")
     arch: PointerProperty(type=ArchProperty)
     size_offset: PointerProperty(type=SizeOffsetProperty)
     frame: PointerProperty(type=FrameProperty)
@@ -46,6 +47,7 @@ class MultigroupProperty(bpy.types.PropertyGroup):
         col = layout.column(align=True)
         col.prop(self, "components", text="Components")
         col.prop(self, "only_hole")
+        col.prop(self, "share_meshes")
 
         if not self.only_hole:
 
@@ -4,7 +4,7 @@ import re
 from ..frame import create_multigroup_frame_and_dw, create_multigroup_hole
 from ..window.window_types import fill_window, add_handles
 from ..door.door_types import fill_door, add_knobs
-from ..fill.fill_types import fill_bars
+from ..fill.fill_types import fill_bars_object
 from ..arch import fill_arch
 from ...utils import (
     valid_ngon,
@@ -16,12 +16,13 @@ from ...utils import (
     set_origin,
     calc_face_dimensions,
     managed_bmesh_edit,
+    SharedMeshes,
     get_opposite_face,
+    opposite_face_cache,
     get_relative_offset,
     crash_safe,
     deselect,
     align_obj,
-    managed_bmesh,
     verify_facemaps_for_object,
 )
 from ..validations import validate, some_selection, ngon_validation, same_dimensions
@@ -33,7 +34,7 @@ def build_multigroup(context, props):
     """ Create multigroup from context and prop, with validations. Intented to be called directly from operator.
     """
     verify_facemaps_for_object(context.object)
-    with managed_bmesh_edit(context.edit_object) as bm:
+    with managed_bmesh_edit(context.edit_object) as bm, opposite_face_cache(bm):
         faces = [f for f in bm.faces if f.select]
         deselect(faces)
         props.init(
@@ -58,6 +59,7 @@ def create_multigroup(bm, faces, prop):
     if not re.match("^[dw]*$", prop.components):
         prop.components = re.sub("[^d|w|]", "", prop.components)
 
+    shared_meshes = SharedMeshes(prop.share_meshes)
     for face in faces:
         array_faces = subdivide_face_horizontally(bm, face, widths=[prop.size_offset.size.x]*prop.count)
         for aface in array_faces:
@@ -97,8 +99,7 @@ def create_multigroup(bm, faces, prop):
                         link_objects([bars], bpy.context.object.users_collection)
                         make_parent([bars], frame)
                         set_origin(bars, origin, frame_origin)
-                        with managed_bmesh(bars) as bars_bm:
-                            fill_bars(bars_bm, bars, bars_bm.faces[0], prop.window.bars)
+                        fill_bars_object(bars, prop.window.bars)
 
                 # set knob origin, rotations and scale
                 for door,knobs,origins,scales in zip(doors,knobs,knob_origins,knob_scales):
@@ -124,8 +125,8 @@ def create_multigroup(bm, faces, prop):
                         fill_arch(arch, prop)
 
                 for door in doors:
-                    fill_door(door, prop)
+                    shared_meshes.fill(door, fill_door, prop)
                 for window in windows:
-                    fill_window(window, prop)
+                    shared_meshes.fill(window, fill_window, prop)
     return True
 
@@ -17,6 +17,8 @@ from .multigroup import register_multigroup, unregister_multigroup
 from .asset import register_asset, unregister_asset
 from .floorplan import register_floorplan, unregister_floorplan
 from .settings import register_settings, unregister_settings, QuickArchSettings
+from .fill import clear_fill_cache
+from ..utils import clear_blend_cache
 
 
 # -- ORDER MATTERS --
@@ -66,10 +68,17 @@ def register_core():
         func()
     bpy.types.Scene.qarch_settings = bpy.props.PointerProperty(type=QuickArchSettings)
     bpy.types.Scene.qarch_preview_collections = {}
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post):
+        handlers.append(clear_blend_cache)
+        handlers.append(clear_fill_cache)
 
 def unregister_core():
     for func in unregister_funcs:
         func()
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post):
+        for handler in (clear_blend_cache, clear_fill_cache):
+            if handler in handlers:
+                handlers.remove(handler)
     for pcoll in bpy.types.Scene.qarch_preview_collections.values():
         bpy.utils.previews.remove(pcoll)
     del bpy.types.Scene.qarch_settings
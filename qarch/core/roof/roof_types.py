@@ -1,22 +1,26 @@
 import bmesh, bpy
-import mathutils, math
+import math
+import itertools as it
+from bisect import bisect_left, bisect_right
 from mathutils import Vector
 from ...utils import (
     equal,
-    vec_equal,
     select,
     filter_invalid,
-    edge_vector,
-    skeletonize,
-    set_roof_type_hip,
-    set_roof_type_gable,
+    cached_skeletonize,
+    cached_skeletonize_many,
+    RoofType,
     verify_facemaps_for_object,
     managed_bmesh,
     mean_vector,
     boundary_edges,
+    boundary_loops,
+    face_islands,
+    loop_area,
     crash_safe,
     managed_bmesh_edit,
     deselect,
+    popup_message,
 )
 from ..validations import validate, some_selection, flat_face_validation
 from ..roof_top.roof_top_types import create_roof_top
@@ -51,52 +55,73 @@ def create_roof(bm, faces, props):
 def create_gable_roof(bm, faces, prop):
     """ Create gable roof
     """
-    median = mean_vector([f.calc_center_bounds() for f in faces])
-    original_edges = boundary_edges(faces)
+    return create_skeleton_roof(bm, faces, prop, RoofType.GABLE_ROOF)
 
-    # -- get verts in anti-clockwise order (required by straight skeleton)
-    verts = [v for v in reversed(sort_verts_clockwise(original_edges))]
-    clean_verts = [v for i,v in enumerate(verts) if not equal(vert_angle(v, verts[i-1], verts[(i+1)%len(verts)]), math.pi)]
-    points = [v.co.to_tuple()[:2] for v in clean_verts]
 
-    # -- compute straight skeleton
-    set_roof_type_gable()
-    skeleton = skeletonize(points, [])
-    height_scale = prop.height / max([arc.height for arc in skeleton])
+def create_hip_roof(bm, faces, prop):
+    """Create a hip roof
+    """
+    return create_skeleton_roof(bm, faces, prop, RoofType.HIP_ROOF)
 
-    # -- create edges and vertices
-    skeleton_edges = create_skeleton_verts_and_edges(
-        bm, skeleton, original_edges, median, height_scale
+
+def create_skeleton_roof(bm, faces, prop, mode):
+    """ Create the roof faces over the straight skeleton of each island of faces, in mode
+    """
+    # -- the straight skeleton does not support holes, it ignores an anti-clockwise hole
+    # -- and returns corrupt arcs for a clockwise one, so islands with holes get no roof
+    islands, outlines, skipped = [], [], 0
+    for island in face_islands(faces):
+        loops = footprint_loops(island)
+        if len(loops) > 1:
+            skipped += 1
+            continue
+        islands.append(island)
+        outlines.append(loops[0])
+    if skipped:
+        popup_message(
+            "{} footprint(s) with holes skipped, roofs over courtyards are not supported".format(skipped),
+            title="Roof Skipped",
+            icon="INFO",
+        )
+
+    # -- compute the straight skeletons together, unchanged footprints come from the
+    # -- cache and changes to prop.height only rescale the arc heights
+    skeletons = cached_skeletonize_many(
+        [skeleton_contour(outline) for outline in outlines], mode=mode
     )
 
-    # -- create faces
-    top_faces = create_skeleton_faces(bm, clean_verts, skeleton_edges, original_edges)
+    top_faces = []
+    for island, outline, skeleton in zip(islands, outlines, skeletons):
+        if not skeleton:
+            continue
+        median = mean_vector([f.calc_center_bounds() for f in island])
+        height_scale = prop.height / max([arc.height for arc in skeleton])
+
+        # -- build the whole roof in plain python, then add it to bm in one pass
+        coords, roof_faces = roof_geometry(
+            [[v.co.to_tuple()[:2] for v in outline]], skeleton, height_scale
+        )
+        top_faces.extend(add_roof_geometry(bm, outline, coords, roof_faces, median.z))
     return [f for f in top_faces if f.normal.z > 0.001]
 
 
-def create_hip_roof(bm, faces, prop):
-    """Create a hip roof
+def create_skeleton_roof_bmesh_ops(bm, faces, prop, mode):
+    """ create_skeleton_roof that adds every skeleton vert and edge through bmesh.ops,
+        kept for comparison with the bulk builder
     """
     median = mean_vector([f.calc_center_bounds() for f in faces])
     original_edges = boundary_edges(faces)
 
-    # -- get verts in anti-clockwise order (required by straight skeleton)
-    verts = [v for v in reversed(sort_verts_clockwise(original_edges))]
-    clean_verts = [v for i,v in enumerate(verts) if not equal(vert_angle(v, verts[i-1], verts[(i+1)%len(verts)]), math.pi)]
-    points = [v.co.to_tuple()[:2] for v in clean_verts]
-
-    # -- compute straight skeleton
-    set_roof_type_hip()
-    skeleton = skeletonize(points, [])
+    verts = footprint_loops(faces)[0]
+    skeleton = cached_skeletonize(skeleton_contour(verts), [], mode=mode, engine="array")
+    if not skeleton:
+        return []
     height_scale = prop.height / max([arc.height for arc in skeleton])
 
-    # -- create edges and vertices
     skeleton_edges = create_skeleton_verts_and_edges(
         bm, skeleton, original_edges, median, height_scale
     )
-
-    # -- create faces
-    top_faces = create_skeleton_faces(bm, clean_verts, skeleton_edges, original_edges)
+    top_faces = create_skeleton_faces(bm, verts, skeleton_edges, original_edges)
     return [f for f in top_faces if f.normal.z > 0.001]
 
 
@@ -106,71 +131,136 @@ def vert_angle(v, v_prev, v_next):
     return v2.angle(v1)
 
 
-def sort_verts_clockwise(boundary_edges):
-    """ sort verts in anti clockwise direction
+def footprint_loops(faces):
+    """ Boundary loops of faces, the outer one first and anti-clockwise, then the holes
+        clockwise, so that faces lie to the left of every loop
     """
-    visited_edges = []
-    e = list(boundary_edges)[0]
-    v = e.verts[0]
-    verts = []
-    angle = 0
-    while e not in visited_edges:
-        visited_edges.append(e)
-        e_next = [edge for edge in v.link_edges if edge in boundary_edges and edge != e][0]
-        angle += interior_angle(e.other_vert(v), v , e_next.other_vert(v))
-        v = e_next.other_vert(v)
-        verts.append(v)
-        e = e_next
-    if angle > 0:
-        return list(reversed(verts))
-    return verts
-
-
-def vert_at_loc(loc, verts, loc_z=None):
+    loops = sorted(
+        boundary_loops(faces), key=lambda loop: abs(loop_area(loop[0])), reverse=True
+    )
+    return [
+        verts if ccw == (i == 0) else list(reversed(verts))
+        for i, (verts, ccw) in enumerate(loops)
+    ]
+
+
+def skeleton_contour(verts):
+    """ (x, y) points of the outer loop of verts without its straight angles, clockwise as
+        the straight skeleton takes them, whatever the order of verts
+    """
+    clean_verts = [v for i,v in enumerate(verts) if not equal(vert_angle(v, verts[i-1], verts[(i+1)%len(verts)]), math.pi)]
+    if loop_area(clean_verts) > 0:
+        clean_verts.reverse()
+    return [v.co.to_tuple()[:2] for v in clean_verts]
+
+
+def vert_at_loc(loc, verts, loc_z=None, location=lambda v: v.co):
     """ Find all verts at loc(x,y), return the one with highest z coord
     """
     results = []
     for vert in verts:
-        co = vert.co
-        if equal(co.x, loc.x) and equal(co.y, loc.y):
+        co = location(vert)
+        if equal(co[0], loc.x) and equal(co[1], loc.y):
             if loc_z:
-                if equal(co.z, loc_z):
+                if equal(co[2], loc_z):
                     results.append(vert)
             else:
                 results.append(vert)
 
     if results:
-        return max([v for v in results], key=lambda v: v.co.z)
+        return max([v for v in results], key=lambda v: location(v)[2])
     return None
 
 
+def skeleton_heights(skeleton):
+    """ Heights of skeleton points keyed by (x, y), as sources (that of the last arc
+        from the point) and as sinks (the lowest arc into the point)
+    """
+    source_heights, sink_heights = {}, {}
+    for arc in skeleton:
+        source_heights[arc.source.x, arc.source.y] = arc.height
+        for sink in arc.sinks:
+            key = (sink.x, sink.y)
+            sink_heights[key] = min(sink_heights.get(key, arc.height), arc.height)
+    return source_heights, sink_heights
+
+
+class VertLocationIndex:
+    """ Verts bucketed by (x, y) location, so that a lookup only visits the verts
+        within eps of the location instead of the whole mesh
+
+        location maps an indexed item to its (x, y, z) coordinates, which lets the
+        index hold plain coordinate indices as well as verts
+    """
+
+    def __init__(self, verts=(), eps=0.001, location=lambda v: v.co):
+        self.eps = eps
+        self.location = location
+        self._cells = {}
+        for vert in verts:
+            self.add(vert)
+
+    def _cell(self, x, y):
+        return math.floor(x / self.eps), math.floor(y / self.eps)
+
+    def add(self, vert):
+        co = self.location(vert)
+        self._cells.setdefault(self._cell(co[0], co[1]), []).append(vert)
+
+    def find(self, loc, loc_z=None):
+        """ vert_at_loc over the indexed verts
+        """
+        i, j = self._cell(loc.x, loc.y)
+        nearby = [
+            vert
+            for cell in it.product((i - 1, i, i + 1), (j - 1, j, j + 1))
+            for vert in self._cells.get(cell, ())
+        ]
+        return vert_at_loc(loc, nearby, loc_z, self.location)
+
+
 def create_skeleton_verts_and_edges(bm, skeleton, original_edges, median, height_scale):
     """ Create the vertices and edges from output of straight skeleton
     """
     skeleton_edges = []
     skeleton_verts = []
+    source_heights, sink_heights = skeleton_heights(skeleton)
+
+    # -- skeleton points either lie on the footprint or get a vert of their own
+    verts = VertLocationIndex({v for e in original_edges for v in e.verts})
+    point_verts = {}
+
+    def skeleton_vert(point, heights):
+        """ Vert at point and whether it was created
+        """
+        key = (point.x, point.y)
+        vert = point_verts.get(key) or verts.find(point)
+        created = not vert
+        if created:
+            ht = heights[key] * height_scale
+            vert = make_vert(bm, Vector((point.x, point.y, median.z + ht)))
+            verts.add(vert)
+        point_verts[key] = vert
+        return vert, created
+
     for arc in skeleton:
-        source = arc.source
-        vsource = vert_at_loc(source, bm.verts)
-        if not vsource:
-            source_height = [arc.height for arc in skeleton if arc.source == source]
-            ht = source_height.pop() * height_scale
-            vsource = make_vert(bm, Vector((source.x, source.y, median.z + ht)))
+        vsource, created = skeleton_vert(arc.source, source_heights)
+        if created:
             skeleton_verts.append(vsource)
 
         for sink in arc.sinks:
-            vs = vert_at_loc(sink, bm.verts)
-            if not vs:
-                sink_height = min([arc.height for arc in skeleton if sink in arc.sinks])
-                ht = height_scale * sink_height
-                vs = make_vert(bm, Vector((sink.x, sink.y, median.z + ht)))
+            vs, _ = skeleton_vert(sink, sink_heights)
             skeleton_verts.append(vs)
 
             # create edge
             if vs != vsource:
                 geom = bmesh.ops.contextual_create(bm, geom=[vsource, vs]).get("edges")
                 skeleton_edges.extend(geom)
-    bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=0.0001)
+
+    # -- only merge the roof's own verts, never the rest of the building
+    roof_verts = {v for e in original_edges for v in e.verts}
+    roof_verts.update(skeleton_verts)
+    bmesh.ops.remove_doubles(bm, verts=list(roof_verts), dist=0.0001)
 
     skeleton_edges = filter_invalid(skeleton_edges)
     S_verts = {v for e in skeleton_edges for v in e.verts}
@@ -179,84 +269,242 @@ def create_skeleton_verts_and_edges(bm, skeleton, original_edges, median, height
     return join_intersections_and_get_skeleton_edges(bm, skeleton_verts, skeleton_edges)
 
 
-def interior_angle(prev_v, v, next_v):
-        """ Determine cross product between two edges with one vert in common. Increases in ACW direction
-        """
-        # XXX Order of vector creation is really important
-        v1 = (prev_v.co - v.co).normalized()
-        v2 = (next_v.co - v.co).normalized()
-        v1.z = 0
-        v2.z = 0
-        return v1.cross(v2).z
-
 # @map_new_faces(FaceMap.ROOF)
 def create_skeleton_faces(bm, verts, skeleton_edges, original_edges):
     """ Create faces formed from hiproof verts and edges
-    """
 
-    def boundary_walk(v, reverse=False):
-        """ Perform boundary walk using least interior angle
-        """
-        first = v
-        prev = v
-        v = [e for e in v.link_edges if e in skeleton_edges][0].other_vert(v)
-        walk = [prev, v]
-        # traverse on skeleton edges
-        while True:
-            linked_verts = [
-                e.other_vert(v) for e in v.link_edges if e in skeleton_edges and e.other_vert(v) not in walk
-            ]
-            if not linked_verts:
-                break
-            v, prev = min(linked_verts, key=lambda next: interior_angle(prev, v, next)), v
-            walk.append(v)
-        # traverse on original edges
-        while v!=first:
-            linked_verts = [e.other_vert(v) for e in v.link_edges if e in original_edges and vec_equal((first.co-v.co).normalized(), (e.other_vert(v).co-v.co).normalized())]
-            if not linked_verts:
-                break
-            v, prev = linked_verts[0], v
-            if v == first:
-                break
-            walk.append(v)
-        return walk
+        verts is the footprint loop, in either order. Every roof face lies to the left
+        of the anti-clockwise footprint edges, and is traced once through the planar
+        graph of skeleton and footprint edges.
+    """
+    verts = filter_invalid(verts)
+    if loop_area(verts) < 0:
+        verts = verts[::-1]
+    edges = filter_invalid(set(skeleton_edges) | set(original_edges))
+    neighbours = planar_neighbours(edge_links(edges), [verts], lambda v: v.co)
 
     result = []
-    for v in filter_invalid(verts):
-        walk = boundary_walk(v)
+    for walk in trace_faces(neighbours, [verts]):
         result.extend(bmesh.ops.contextual_create(bm, geom=walk).get("faces"))
     return result
 
 
+def edge_links(edges):
+    """ Map each vert of edges to the verts it shares an edge with
+    """
+    links = {}
+    for e in edges:
+        a, b = e.verts
+        links.setdefault(a, set()).add(b)
+        links.setdefault(b, set()).add(a)
+    return links
+
+
+def planar_neighbours(links, loops, location):
+    """ Linked neighbours of each vert, sorted anti-clockwise in the xy plane around
+        its location
+
+        Edges that run along an edge of one of the loops, like gable ends lying on the
+        footprint, are ordered as if they leaned a little to the left of the loop,
+        the side the faces are on.
+    """
+    outgoing = {u: v for loop in loops for u, v in zip(loop, loop[1:] + loop[:1])}
+    incoming = {v: u for u, v in outgoing.items()}
+
+    def angle(v, w):
+        a, b = location(v), location(w)
+        return math.atan2(b[1] - a[1], b[0] - a[0])
+
+    eps = 1e-6
+    result = {}
+    for v, ws in links.items():
+        keys = {w: angle(v, w) for w in ws}
+        for along, lean in ((outgoing.get(v), 1), (incoming.get(v), -1)):
+            if along not in keys:
+                continue
+            for w in ws:
+                diff = (keys[w] - keys[along] + math.pi) % (2 * math.pi) - math.pi
+                if w != along and abs(diff) < eps:
+                    keys[w] = keys[along] + lean * eps
+        result[v] = sorted(ws, key=keys.get)
+    return result
+
+
+def trace_faces(neighbours, loops):
+    """ Verts of every face to the left of the edges of loops
+    """
+    position = {v: {w: i for i, w in enumerate(ns)} for v, ns in neighbours.items()}
+    limit = sum(len(ns) for ns in neighbours.values()) + 1
+
+    used = set()
+    result = []
+    for loop in loops:
+        for start in zip(loop, loop[1:] + loop[:1]):
+            if start in used or start[1] not in position.get(start[0], ()):
+                continue
+            walk = trace_face(start, neighbours, position, used, limit)
+            if walk:
+                result.append(walk)
+    return result
+
+
+def trace_face(start, neighbours, position, used, limit):
+    """ Verts of the face to the left of the directed edge start, found by turning to
+        the next edge clockwise at every vert. None if the walk does not close
+    """
+    walk = []
+    u, v = start
+    for _ in range(limit):
+        # -- step back out of dead ends instead of keeping them in the face
+        if len(walk) > 1 and walk[-2] == u:
+            walk.pop()
+        else:
+            walk.append(u)
+        used.add((u, v))
+        u, v = v, neighbours[v][position[v][u] - 1]
+        if (u, v) == start:
+            return walk
+    return None
+
+
+def roof_geometry(loops, skeleton, height_scale, eps=0.0001):
+    """ Roof over the footprint loops of (x, y) points, as plain lists. The outer loop
+        runs anti-clockwise and holes clockwise
+
+        Returns coords, the (x, y, height) of every roof point with the loops first and
+        in order, and faces, each a list of indices into coords. Skeleton points match
+        footprint points and each other as create_skeleton_verts_and_edges merges
+        verts, and points that lie on an arc split it.
+    """
+    coords = [(x, y, 0.0) for loop in loops for x, y in loop]
+    footprint = []
+    for loop in loops:
+        start = sum(len(indices) for indices in footprint)
+        footprint.append(list(range(start, start + len(loop))))
+    footprint_size = len(coords)
+    points = VertLocationIndex(range(len(coords)), location=coords.__getitem__)
+    source_heights, sink_heights = skeleton_heights(skeleton)
+    point_index = {}
+
+    def skeleton_point(point, heights):
+        key = (point.x, point.y)
+        index = point_index.get(key)
+        if index is None:
+            index = points.find(point)
+        if index is None:
+            index = len(coords)
+            coords.append((point.x, point.y, heights[key] * height_scale))
+            points.add(index)
+        point_index[key] = index
+        return index
+
+    arcs = set()
+    for arc in skeleton:
+        source = skeleton_point(arc.source, source_heights)
+        for sink in arc.sinks:
+            index = skeleton_point(sink, sink_heights)
+            if index != source:
+                arcs.add((min(source, index), max(source, index)))
+
+    # -- arcs through other roof points are split at each of them, nearest first
+    ends = {i for arc in arcs for i in arc if i >= footprint_size}
+    location = coords.__getitem__
+    for (a, b), on_arc in verts_on_edges(arcs, ends, eps, lambda e: e, location).items():
+        arcs.discard((a, b))
+        ax, ay = coords[a][:2]
+        chain = [a] + sorted(
+            on_arc, key=lambda i: math.hypot(coords[i][0] - ax, coords[i][1] - ay)
+        ) + [b]
+        arcs.update(zip(chain, chain[1:]))
+
+    links = {}
+    loop_edges = (zip(loop, loop[1:] + loop[:1]) for loop in footprint)
+    for a, b in it.chain(arcs, *loop_edges):
+        links.setdefault(a, set()).add(b)
+        links.setdefault(b, set()).add(a)
+
+    neighbours = planar_neighbours(links, footprint, location)
+    return coords, trace_faces(neighbours, footprint)
+
+
+def add_roof_geometry(bm, verts, coords, faces, base_z):
+    """ Add the roof_geometry coords and faces to bm, reusing the footprint verts for
+        the leading coords. Faces that already exist in bm are skipped, the new ones
+        come back with their normals set
+    """
+    roof_verts = list(verts)
+    roof_verts.extend(
+        bm.verts.new((x, y, base_z + z)) for x, y, z in coords[len(roof_verts):]
+    )
+
+    result = []
+    for face in faces:
+        try:
+            result.append(bm.faces.new([roof_verts[i] for i in face]))
+        except ValueError:
+            continue
+        result[-1].normal_update()
+    return result
+
+
 def make_vert(bm, location):
     """ Create a vertex at locatiosn
     """
     return bmesh.ops.create_vert(bm, co=location).get("vert").pop()
 
 
+def verts_on_edges(edges, verts, eps, ends=lambda e: e.verts, location=lambda v: v.co):
+    """ Map edges to the verts, other than their own, within eps of them in the xy plane
+
+        Verts are swept in order of x, so each edge only tests the verts in its x range
+    """
+    verts = sorted(verts, key=lambda v: location(v)[0])
+    xs = [location(v)[0] for v in verts]
+    result = {}
+    for e in edges:
+        a, b = ends(e)
+        (ax, ay), (bx, by) = location(a)[:2], location(b)[:2]
+        dx, dy = bx - ax, by - ay
+        length_sq = dx * dx + dy * dy
+        if length_sq == 0:
+            continue
+
+        lo = bisect_left(xs, min(ax, bx) - eps)
+        hi = bisect_right(xs, max(ax, bx) + eps)
+        for v in verts[lo:hi]:
+            if v == a or v == b:
+                continue
+            px, py = location(v)[:2]
+            t = ((px - ax) * dx + (py - ay) * dy) / length_sq
+            if 0.0 < t < 1.0 and math.hypot(ax + dx * t - px, ay + dy * t - py) <= eps:
+                result.setdefault(e, []).append(v)
+    return result
+
+
 def join_intersecting_verts_and_edges(bm, edges, verts):
     """ Find all vertices that intersect/ lie at an edge and merge
         them to that edge
     """
     eps = 0.0001
     new_verts = []
-    for v in verts:
-        for e in edges:
-            if v in e.verts:
+    for e, on_edge in verts_on_edges(edges, verts, eps).items():
+        # -- split the edge from v1 towards v2 once per vert, nearest first
+        split_vert, end = e.verts
+        length = e.calc_length()
+        done = 0.0
+        for factor in sorted((split_vert.co - v.co).length / length for v in on_edge):
+            if factor <= done or factor >= 1.0:
                 continue
-
-            v1, v2 = e.verts
-            ortho = edge_vector(e).orthogonal().normalized() * eps
-            res = mathutils.geometry.intersect_line_line_2d(v.co, v.co, v1.co, v2.co)
-            if res is None:
-                res = mathutils.geometry.intersect_line_line_2d(v.co - ortho, v.co + ortho, v1.co, v2.co)
-
-            if res:
-                split_vert = v1
-                split_factor = (v1.co - v.co).length / e.calc_length()
-                new_edge, new_vert = bmesh.utils.edge_split(e, split_vert, split_factor)
-                new_verts.append(new_vert)
-    bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=0.0001)
+            new_edge, new_vert = bmesh.utils.edge_split(
+                e, split_vert, (factor - done) / (1.0 - done)
+            )
+            new_verts.append(new_vert)
+            e = e if end in e.verts else new_edge
+            split_vert, done = new_vert, factor
+
+    roof_verts = {v for e in filter_invalid(edges) for v in e.verts}
+    roof_verts.update(filter_invalid(verts), new_verts)
+    bmesh.ops.remove_doubles(bm, verts=list(roof_verts), dist=0.0001)
     return filter_invalid(new_verts)
 
 
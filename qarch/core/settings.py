@@ -1,11 +1,41 @@
 import bpy
+from .fill import fill_cache
+
+
+def update_fill_cache_size(self, context):
+    fill_cache.resize(self.fill_cache_size)
 
 
 class QuickArchSettings(bpy.types.PropertyGroup):
     libpath: bpy.props.StringProperty(name="Library Path", description="Path to Chocofur style Asset Library", subtype="DIR_PATH")
+    fill_cache_size: bpy.props.IntProperty(
+        name="Fill Cache Size",
+        min=0,
+        max=4096,
+        default=fill_cache.maxsize,
+        description="Number of filled door, window and arch shapes kept for reuse (0 to disable)",
+        update=update_fill_cache_size,
+    )
+
+
+class QARCH_OT_clear_fill_cache(bpy.types.Operator):
+    """Forget the filled shapes kept for reuse"""
+
+    bl_idname = "qarch.clear_fill_cache"
+    bl_label = "Clear Fill Cache"
+
+    def execute(self, context):
+        fill_cache.clear()
+        return {"FINISHED"}
+
+
+classes = (QuickArchSettings, QARCH_OT_clear_fill_cache)
+
 
 def register_settings():
-    bpy.utils.register_class(QuickArchSettings)
+    for cls in classes:
+        bpy.utils.register_class(cls)
 
 def unregister_settings():
-    bpy.utils.unregister_class(QuickArchSettings)
\ No newline at end of file
+    for cls in classes:
+        bpy.utils.unregister_class(cls)
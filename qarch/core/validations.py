@@ -8,6 +8,7 @@ from ..utils import (
     equal,
     valid_ngon,
     calc_face_dimensions,
+    face_metrics_cache,
 )
 
 
@@ -16,12 +17,13 @@ def validate(validations, messages=[]):
         def inner(*args, **kwargs):
             # validate before executing
             bm = bmesh.from_edit_mesh(get_edit_mesh())
-            faces = [face for face in bm.faces if face.select]
-            for (val,msg) in zip(validations,messages):
-                if not val(faces):
-                    raise Exception(msg)
-            # execute function
-            return function(*args, **kwargs)
+            with face_metrics_cache(bm):
+                faces = [face for face in bm.faces if face.select]
+                for (val,msg) in zip(validations,messages):
+                    if not val(faces):
+                        raise Exception(msg)
+                # execute function
+                return function(*args, **kwargs)
         return inner
     return decorator
 
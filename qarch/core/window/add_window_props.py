@@ -10,6 +10,7 @@ class AddWindowProperty(bpy.types.PropertyGroup):
 
     count: CountProperty
     only_hole: BoolProperty(name="Only hole", default=False, description="Only hole. No window/frame")
+    share_meshes: BoolProperty(name="Share Meshes", default=False, description="Link identical windows to one mesh instead of filling each")
     arch: PointerProperty(type=ArchProperty)
     size_offset: PointerProperty(type=SizeOffsetProperty)
     frame: PointerProperty(type=FrameProperty)
@@ -34,6 +35,7 @@ class AddWindowProperty(bpy.types.PropertyGroup):
 
         col = layout.column(align=True)
         col.prop(self, "only_hole")
+        col.prop(self, "share_meshes")
 
         if not self.only_hole:
 
@@ -3,7 +3,7 @@ import os
 from pathlib import Path
 
 from ..generic import clamp_count
-from ..fill import fill_face, fill_bars
+from ..fill import fill_face, fill_bars_object, cached_fill
 from ..arch import fill_arch
 
 from ...utils import (
@@ -18,12 +18,14 @@ from ...utils import (
     extrude_face_region,
     managed_bmesh,
     managed_bmesh_edit,
+    SharedMeshes,
     get_opposite_face,
+    opposite_face_cache,
     get_relative_offset,
     crash_safe,
     duplicate_faces,
     deselect,
-    import_blend,
+    cached_import_blend,
     local_xyz,
     align_obj,
     shrink_face,
@@ -39,7 +41,7 @@ def build_window(context, props):
     """ Create window from context and prop, with validations. Intented to be called directly from operator.
     """
     verify_facemaps_for_object(context.object)
-    with managed_bmesh_edit(context.edit_object) as bm:
+    with managed_bmesh_edit(context.edit_object) as bm, opposite_face_cache(bm):
         faces = [f for f in bm.faces if f.select]
         deselect(faces)
         props.init(
@@ -54,6 +56,7 @@ def build_window(context, props):
 def create_window(bm, faces, prop):
     """Generate a window
     """
+    shared_meshes = SharedMeshes(prop.share_meshes)
     for face in faces:
         clamp_count(calc_face_dimensions(face)[0], prop.frame.thickness * 2, prop)
         array_faces = subdivide_face_horizontally(bm, face, widths=[prop.size_offset.size.x]*prop.count)
@@ -86,8 +89,7 @@ def create_window(bm, faces, prop):
                     link_objects([bars], bpy.context.object.users_collection)
                     make_parent([bars], frame)
                     set_origin(bars, window_origins[0], frame_origin)
-                    with managed_bmesh(bars) as bm2:
-                        fill_bars(bm2, bars, bm2.faces[0], prop.window.bars)
+                    fill_bars_object(bars, prop.window.bars)
 
                 # set handle origin, rotations and scale
                 for handle,origin,scale in zip(handles,handle_origins,handle_scales):
@@ -110,10 +112,11 @@ def create_window(bm, faces, prop):
                         fill_arch(arch, prop)
 
                 for window in windows:
-                    fill_window(window, prop)
+                    shared_meshes.fill(window, fill_window, prop)
     return True
 
 
+@cached_fill(lambda prop: prop.window)
 def fill_window(window, prop):
     """Create extra elements on face
     """
@@ -139,10 +142,10 @@ def add_handles(window_faces, window_origins, window_thickness, handle_type, fli
             handle_scales.append([None])
             continue
         if handle_type == "STRAIGHT":
-            handle_front = import_blend(os.path.join(directory, 'assets', 'handle_straight.blend'))[0]
+            handle_front = cached_import_blend(os.path.join(directory, 'assets', 'handle_straight.blend'))[0]
             # handle_back = import_blend(os.path.join(directory, 'assets', 'handle_straight.blend'))[0]
         if handle_type == "ROUND":
-            handle_front = import_blend(os.path.join(directory, 'assets', 'handle_round.blend'))[0]
+            handle_front = cached_import_blend(os.path.join(directory, 'assets', 'handle_round.blend'))[0]
             # handle_back = import_blend(os.path.join(directory, 'assets', 'handle_round.blend'))[0]
         xyz = local_xyz(window_face)
         window_width,_ = calc_face_dimensions(window_face)
@@ -4,4 +4,11 @@ from .util_common import *
 from .util_object import *
 from .util_geometry import *
 from .util_material import *
-from .util_skeleton import skeletonize, set_roof_type_hip, set_roof_type_gable
+from .util_skeleton import (
+    skeletonize,
+    cached_skeletonize,
+    cached_skeletonize_many,
+    skeletonize_many,
+    skeleton_cache,
+    RoofType,
+)
@@ -1,6 +1,7 @@
 import io
 import pstats
 import cProfile
+import time
 from os import devnull
 
 from contextlib import contextmanager, redirect_stderr, redirect_stdout
@@ -28,3 +29,121 @@ def suppress_stdout_stderr():
     with open(devnull, 'w') as fnull:
         with redirect_stderr(fnull) as err, redirect_stdout(fnull) as out:
             yield (err, out)
+
+
+def comb_footprint(edges=500, depth=3.0):
+    """ Counter-clockwise comb shaped footprint with about `edges` edges, a rectangle
+        with a row of one unit wide teeth along its top
+    """
+    teeth = max(1, (edges - 2) // 4)
+    points = [(0.0, 0.0), (2.0 * teeth, 0.0)]
+    for k in reversed(range(teeth)):
+        points.extend(
+            [
+                (2.0 * k + 2, 1.0 + depth),
+                (2.0 * k + 1, 1.0 + depth),
+                (2.0 * k + 1, 1.0),
+                (2.0 * k, 1.0),
+            ]
+        )
+    return points
+
+
+def benchmark_skeleton(edges=500, mode=None, repeat=3):
+    """ Print and return the best time of skeletonize per engine on a comb_footprint
+    """
+    from .util_skeleton import RoofType, SKELETON_ENGINES, skeletonize
+
+    mode = mode or RoofType.GABLE_ROOF
+    points = comb_footprint(edges)
+    timings = {}
+    for engine in SKELETON_ENGINES:
+        runs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            skeletonize(points[::-1], [], mode, engine)
+            runs.append(time.perf_counter() - start)
+        timings[engine] = min(runs)
+        print(
+            "{} {} edges, {}: {:.4f}s".format(
+                mode.name, len(points), engine, timings[engine]
+            )
+        )
+    return timings
+
+
+def benchmark_roof(sizes=(50, 500, 5000), mode=None):
+    """ Print and return the time the bmesh.ops and the bulk roof builders take to turn
+        the skeleton of a comb_footprint of each size into roof faces
+    """
+    import bmesh
+    from .util_skeleton import RoofType, skeletonize
+    from ..core.roof.roof_types import (
+        add_roof_geometry,
+        create_skeleton_faces,
+        create_skeleton_verts_and_edges,
+        roof_geometry,
+    )
+
+    mode = mode or RoofType.HIP_ROOF
+    timings = {}
+    for size in sizes:
+        points = comb_footprint(size)
+        skeleton = skeletonize(points[::-1], [], mode, "array")
+        height_scale = 1.0 / max(arc.height for arc in skeleton)
+        for path in ("bmesh.ops", "bulk"):
+            bm = bmesh.new()
+            verts = [bm.verts.new((x, y, 0.0)) for x, y in points]
+            face = bm.faces.new(verts)
+
+            start = time.perf_counter()
+            if path == "bulk":
+                coords, faces = roof_geometry([points], skeleton, height_scale)
+                add_roof_geometry(bm, verts, coords, faces, 0.0)
+            else:
+                original_edges = list(face.edges)
+                skeleton_edges = create_skeleton_verts_and_edges(
+                    bm, skeleton, original_edges, face.calc_center_bounds(), height_scale
+                )
+                create_skeleton_faces(bm, verts, skeleton_edges, original_edges)
+            timings[size, path] = time.perf_counter() - start
+            bm.free()
+
+            print(
+                "{} {} edges, {}: {:.4f}s".format(
+                    mode.name, len(points), path, timings[size, path]
+                )
+            )
+    return timings
+
+
+def benchmark_face_with_verts(faces=1000000, lookups=1000):
+    """ Print and return the mean time face_with_verts takes to find a face of a grid
+        with about `faces` faces
+    """
+    import bmesh
+    from .util_mesh import face_with_verts
+
+    bm = bmesh.new()
+    segments = int(faces ** 0.5) + 1
+    bmesh.ops.create_grid(bm, x_segments=segments, y_segments=segments, size=1.0)
+    bm.faces.ensure_lookup_table()
+    step = max(1, len(bm.faces) // lookups)
+    targets = [bm.faces[i] for i in range(0, len(bm.faces), step)][:lookups]
+
+    start = time.perf_counter()
+    found = [face_with_verts(bm, list(f.verts)) for f in targets]
+    elapsed = (time.perf_counter() - start) / len(targets)
+    assert found == targets
+    print("face_with_verts, {} faces: {:.2e}s".format(len(bm.faces), elapsed))
+    bm.free()
+    return elapsed
+
+
+@contextmanager
+def timed(label):
+    """ Print the wall time spent in the block
+    """
+    start = time.perf_counter()
+    yield
+    print("{}: {:.4f}s".format(label, time.perf_counter() - start))
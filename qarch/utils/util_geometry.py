@@ -110,13 +110,11 @@ def create_cube_without_faces(bm, size, position=Vector((0, 0, 0)), **directions
 
 
 def split_faces(original_bm, faces_list, objs_name_list, delete_original=True):
-    objs = []
+    objs = new_objs_from_faces(faces_list, objs_name_list, original_bm)
     all_faces = []
-    for faces,name in zip(faces_list, objs_name_list):
-        obj = new_obj_from_faces(faces, name)
+    for obj, faces in zip(objs, faces_list):
         if bpy.app.version >= (4, 0, 0):  # need a zero index material
             mat = create_object_material(obj, "Default")
-        objs.append(obj)
         verify_facemaps_for_object(obj)
         all_faces += faces
     if delete_original:
@@ -125,24 +123,86 @@ def split_faces(original_bm, faces_list, objs_name_list, delete_original=True):
 
 
 def new_obj_from_faces(faces, name):
-    new_vert = dict()
-    bm = bmesh.new()
-    for v in {v for f in faces for v in f.verts}:
-        vert = bm.verts.new(v.co)
-        new_vert[v] = vert
-    for f in set(faces):
-        bm.faces.new(new_vert[v] for v in f.verts)
+    return new_objs_from_faces([faces], [name])[0]
+
+
+def new_objs_from_faces(faces_list, names, bm=None):
+    """ One new object per group of faces in faces_list, named from names
+
+        Each mesh is filled in bulk with foreach_set instead of through a temporary
+        bmesh. Face map values are copied over when bm, the bmesh the faces belong
+        to, is given
+    """
+    facemap_key = None
+    if bm is not None:
+        if bpy.app.version < (4, 0, 0):
+            facemap_key = bm.faces.layers.face_map.active
+        else:
+            facemap_key = bm.faces.layers.int.get(FaceMap.FACEMAP.name)
+
+    objs = []
+    for faces, name in zip(faces_list, names):
+        me = mesh_from_faces(faces, facemap_key)
+        obj = bpy.data.objects.new(name, me)
+        if bpy.app.version >= (4, 0, 0):  # need a zero index material
+            create_object_material(obj, "Default")
+        objs.append(obj)
+    return objs
+
+
+def mesh_from_faces(faces, facemap_key=None):
+    """ New mesh with copies of faces, their verts shared as in the source mesh
+    """
+    faces = list(dict.fromkeys(faces))
+    vert_index = {}
+    coords, polygons = [], []
+    for f in faces:
+        polygon = []
+        for v in f.verts:
+            index = vert_index.get(v)
+            if index is None:
+                index = vert_index[v] = len(vert_index)
+                coords.extend(v.co)
+            polygon.append(index)
+        polygons.append(polygon)
+
+    facemaps = None
+    if facemap_key is not None:
+        facemaps = [f[facemap_key] for f in faces]
+    return mesh_from_arrays(coords, polygons, facemaps)
+
+
+def mesh_from_arrays(coords, polygons, facemaps=None):
+    """ New mesh from flat vert coords and per polygon vert indices, with a face map layer
+        holding facemaps (no face map when None)
+    """
+    loop_verts, loop_starts, loop_totals = [], [], []
+    for polygon in polygons:
+        loop_starts.append(len(loop_verts))
+        loop_totals.append(len(polygon))
+        loop_verts.extend(polygon)
+
     me = bpy.data.meshes.new("Mesh")
+    me.vertices.add(len(coords) // 3)
+    me.vertices.foreach_set("co", coords)
+    me.loops.add(len(loop_verts))
+    me.loops.foreach_set("vertex_index", loop_verts)
+    me.polygons.add(len(polygons))
+    me.polygons.foreach_set("loop_start", loop_starts)
     if bpy.app.version < (4, 0, 0):
-        bm.faces.layers.face_map.verify()
-    else:
-        bm.faces.layers.int.new(FaceMap.FACEMAP.name)
-    bm.to_mesh(me)
-    obj = bpy.data.objects.new(name, me)
-    if bpy.app.version >= (4, 0, 0):  # need a zero index material
-        mat = create_object_material(obj, "Default")
+        me.polygons.foreach_set("loop_total", loop_totals)
+    me.update(calc_edges=True)
+
+    if facemaps is None:
+        # -- no face map, as a new face_map layer holds
+        facemaps = [-1 if bpy.app.version < (4, 0, 0) else 0] * len(polygons)
 
-    return obj
+    if bpy.app.version < (4, 0, 0):
+        me.face_maps.new().data.foreach_set("value", facemaps)
+    else:
+        layer = me.attributes.new(FaceMap.FACEMAP.name, "INT", "FACE")
+        layer.data.foreach_set("value", facemaps)
+    return me
 
 
 def set_origin(obj, origin, parent_origin=Vector((0,0,0))):
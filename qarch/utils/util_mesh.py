@@ -3,7 +3,11 @@ import math
 import bmesh
 import operator
 import functools as ft
+import numpy as np
+from collections import Counter
 from mathutils import Vector, Quaternion
+from mathutils.kdtree import KDTree
+from mathutils.bvhtree import BVHTree
 from bmesh.types import BMVert, BMEdge, BMFace
 from contextlib import contextmanager
 from .util_common import local_xyz, equal, radius_to_side_length
@@ -118,19 +122,122 @@ def is_parallel(a, b):
 def filter_vertical_edges(edges, normal):
     """ Determine edges that are vertical based on a normal value
     """
-    return [e for e in edges if equal(edge_vector(e).dot(Vector((0,0,1))), 1) or equal(edge_vector(e).dot(Vector((0,0,1))), -1)]
+    edges = list(edges)
+    orientations = edge_orientations().classes(edges)
+    return [e for e, o in zip(edges, orientations) if o == EdgeOrientations.VERTICAL]
 
 
 def filter_horizontal_edges(edges, normal):
     """ Determine edges that are horizontal based on a normal value
     """
-    return [e for e in edges if equal(edge_vector(e).dot(Vector((0,0,1))), 0)]
+    edges = list(edges)
+    orientations = edge_orientations().classes(edges)
+    return [e for e, o in zip(edges, orientations) if o == EdgeOrientations.HORIZONTAL]
 
 
 def filter_parallel_edges(edges, dir):
     """ Determine edges that are parallel to a vector
     """
-    return [e for e in edges if is_parallel(edge_vector(e), dir)]
+    edges = list(edges)
+    parallel = edge_orientations().parallel(edges, dir)
+    return [e for e, p in zip(edges, parallel) if p]
+
+
+class EdgeOrientations:
+    """ Unit direction and orientation of edges, worked out with numpy for all the edges
+        of a call at once
+
+        Entries are kept per edge with the coordinates of its verts, so an edge whose
+        verts moved is classified again, and are all dropped when the topology of bm
+        changes
+    """
+
+    VERTICAL, HORIZONTAL, SLOPED = range(3)
+
+    def __init__(self, bm=None, edges=(), eps=0.001):
+        self.bm = bm
+        self.eps = eps
+        self._state = self._bm_state()
+        self._entries = {}
+        self.entries(edges)
+
+    def _bm_state(self):
+        bm = self.bm
+        if bm is None or not bm.is_valid:
+            return None
+        return (len(bm.verts), len(bm.edges), len(bm.faces))
+
+    def invalidate(self):
+        self._entries.clear()
+
+    def entries(self, edges):
+        """ (unit direction, orientation) of each of edges
+        """
+        state = self._bm_state()
+        if state != self._state:
+            self.invalidate()
+            self._state = state
+
+        edges = list(edges)
+        keys = {}
+        for e in edges:
+            if e not in keys:
+                keys[e] = e.verts[0].co.to_tuple() + e.verts[1].co.to_tuple()
+        entries = self._entries
+        stale = [e for e, key in keys.items() if e not in entries or entries[e][0] != key]
+        if stale:
+            co = np.array([keys[e] for e in stale], dtype=float).reshape(-1, 2, 3)
+            d = co[:, 1] - co[:, 0]
+            length = np.linalg.norm(d, axis=1)[:, np.newaxis]
+            unit = np.divide(d, length, out=np.zeros_like(d), where=length > 0)
+            uz = np.abs(unit[:, 2])
+            orientation = np.where(
+                np.abs(uz - 1) <= self.eps,
+                self.VERTICAL,
+                np.where(uz <= self.eps, self.HORIZONTAL, self.SLOPED),
+            )
+            for e, u, o in zip(stale, unit.tolist(), orientation.tolist()):
+                entries[e] = (keys[e], u, o)
+        return [entries[e][1:] for e in edges]
+
+    def classes(self, edges):
+        """ VERTICAL, HORIZONTAL or SLOPED for each of edges
+        """
+        return [entry[1] for entry in self.entries(edges)]
+
+    def parallel(self, edges, direction):
+        """ Whether each of edges runs along or against direction, as is_parallel
+        """
+        entries = self.entries(edges)
+        if not entries:
+            return []
+        unit = np.array([entry[0] for entry in entries], dtype=float)
+        direction = np.array(direction.normalized(), dtype=float)
+        angle = np.arccos(np.clip(unit @ direction, -1.0, 1.0))
+        valid = unit.any(axis=1)
+        return (valid & ((angle < 0.001) | (angle > math.pi - 0.001))).tolist()
+
+
+_edge_orientations = None
+
+
+def edge_orientations():
+    """ The EdgeOrientations of the current edge_orientation_cache block, or a fresh one
+    """
+    return _edge_orientations or EdgeOrientations()
+
+
+@contextmanager
+def edge_orientation_cache(bm=None, edges=()):
+    """ Share one EdgeOrientations of bm between the filter helpers within the block,
+        starting with edges classified in a single pass
+    """
+    global _edge_orientations
+    previous, _edge_orientations = _edge_orientations, EdgeOrientations(bm, edges)
+    try:
+        yield _edge_orientations
+    finally:
+        _edge_orientations = previous
 
 
 def calc_edge_median(edge):
@@ -148,6 +255,14 @@ def calc_verts_median(verts):
 def calc_face_dimensions(face):
     """ Determine the width and height of face
     """
+    if _face_metrics is not None:
+        return _face_metrics.dimensions(face)
+    return face_dimensions(face)
+
+
+def face_dimensions(face):
+    """ calc_face_dimensions without the face_metrics_cache
+    """
     horizontal_edges = filter_horizontal_edges(face.edges, face.normal)
     vertical_edges = filter_vertical_edges(face.edges, face.normal)
     width = sum(e.calc_length() for e in horizontal_edges) / 2
@@ -155,16 +270,91 @@ def calc_face_dimensions(face):
     return width, height
 
 
+class FaceMetrics:
+    """ Width and height, center and local xyz of faces, memoized per face until the
+        topology of bm changes or the verts of the face move
+
+        hits and misses count the lookups answered from the cache and computed
+    """
+
+    def __init__(self, bm):
+        self.bm = bm
+        self.hits = 0
+        self.misses = 0
+        self._state = None
+        self._metrics = {"dimensions": {}, "center": {}, "xyz": {}}
+
+    def _lookup(self, kind, face, compute):
+        bm = self.bm
+        state = (len(bm.verts), len(bm.edges), len(bm.faces))
+        if state != self._state:
+            self.clear()
+            self._state = state
+
+        # -- verts moved without a topology edit still count as a change
+        key = tuple(v.co.to_tuple() for v in face.verts)
+        metrics = self._metrics[kind]
+        if face in metrics and metrics[face][0] == key:
+            self.hits += 1
+        else:
+            self.misses += 1
+            metrics[face] = (key, compute(face))
+        return metrics[face][1]
+
+    def dimensions(self, face):
+        return self._lookup("dimensions", face, face_dimensions)
+
+    def center(self, face):
+        return self._lookup("center", face, BMFace.calc_center_bounds).copy()
+
+    def xyz(self, face):
+        return tuple(v.copy() for v in self._lookup("xyz", face, local_xyz))
+
+    def clear(self):
+        for metrics in self._metrics.values():
+            metrics.clear()
+
+
+_face_metrics = None
+
+
+@contextmanager
+def face_metrics_cache(bm):
+    """ Memoize calc_face_dimensions and get_relative_offset of the faces of bm within the
+        block
+
+        Nested blocks for the same bm share the outer FaceMetrics, so a cache opened
+        around the validations of an operator also serves its managed_bmesh_edit block.
+        A block for another bm, like the temporary bmesh of managed_bmesh, gets its own
+        FaceMetrics, dropped with its faces when the block ends
+    """
+    global _face_metrics
+    if _face_metrics is not None and _face_metrics.bm is bm:
+        yield _face_metrics
+        return
+
+    previous, _face_metrics = _face_metrics, FaceMetrics(bm)
+    try:
+        yield _face_metrics
+    finally:
+        _face_metrics = previous
+
+
 def face_with_verts(bm, verts, default=None):
     """ Find a face in the bmesh with the given verts
+
+        Only faces linked to every one of verts qualify, so the search visits the
+        faces around verts rather than the whole bmesh
     """
-    for face in bm.faces:
-        equal = map(
-            operator.eq,
-            sorted(verts, key=operator.attrgetter("index")),
-            sorted(face.verts, key=operator.attrgetter("index")),
-        )
-        if len(face.verts) == len(verts) and all(equal):
+    verts = set(verts)
+    if not verts:
+        return default
+
+    candidates = set(next(iter(verts)).link_faces)
+    for v in verts:
+        candidates.intersection_update(v.link_faces)
+    for face in candidates:
+        if len(face.verts) == len(verts) and verts.issuperset(face.verts):
             return face
     return default
 
@@ -206,13 +396,8 @@ def subdivide_edge(bm, edge, direction, widths):
     cuts = len(widths) - 1
     res = bmesh.ops.subdivide_edges(bm, edges=[edge], cuts=cuts)
     inner_verts = sort_verts(filter_geom(res.get("geom_split"), BMVert), dir)
-    distance = sum(widths) / len(widths)
-    final_position = 0.0
-    for i in range(cuts):
-        original_position = (i + 1) * distance
-        final_position += widths[i]
-        diff = final_position - original_position
-        bmesh.ops.translate(bm, verts=[inner_verts[i]], vec=diff * dir)
+    for vert, offset in zip(inner_verts, cut_offsets(widths)):
+        vert.co += offset * dir
     return sort_edges(filter_geom(res.get("geom_split"), BMEdge), dir)
 
 
@@ -224,17 +409,26 @@ def subdivide_edges(bm, edges, direction, widths):
     n_edges = len(edges)
     res = bmesh.ops.subdivide_edges(bm, edges=edges, cuts=cuts)
     inner_edges = sort_edges(filter_geom(res.get("geom_inner"), BMEdge), dir)
-    distance = sum(widths) / len(widths)
-    final_position = 0.0
-    for i in range(cuts):
+    for i, offset in enumerate(cut_offsets(widths)):
         ith_cut = inner_edges[i*(n_edges-1):(i+1)*(n_edges-1)]
-        original_position = (i + 1) * distance
-        final_position += widths[i]
-        diff = final_position - original_position
-        bmesh.ops.translate(bm, verts=list({v for e in ith_cut for v in e.verts}), vec=diff * dir)
+        vec = offset * dir
+        for v in {v for e in ith_cut for v in e.verts}:
+            v.co += vec
     return inner_edges
 
 
+def cut_offsets(widths):
+    """ Distance from each even cut of subdivide_edges to where widths put it
+    """
+    distance = sum(widths) / len(widths)
+    final_position = 0.0
+    offsets = []
+    for i, width in enumerate(widths[:-1]):
+        final_position += width
+        offsets.append(final_position - (i + 1) * distance)
+    return offsets
+
+
 def arc_edge(bm, edge, resolution, arc_height, arc_offset, xyz):
     """ Subdivide the given edge and offset vertices to form an arc
     """
@@ -337,12 +531,25 @@ def edge_to_cylinder(bm, edge, radius, up, n=4, fill=False):
 
 
 def closest_faces(faces, locations):
-    def get_face(faces, location):
-        for f in faces:
-            if equal((f.calc_center_bounds() - location).length, 0):
-                return f
+    """ Face centered at each of locations, None where there is none
+
+        Face centers go into a KD-tree once, so each location is a single nearest
+        lookup instead of a pass over every face
+    """
+    if not faces:
+        return [None for _ in locations]
+
+    tree = KDTree(len(faces))
+    for i, f in enumerate(faces):
+        tree.insert(f.calc_center_bounds(), i)
+    tree.balance()
+
+    def get_face(location):
+        _, index, dist = tree.find(location)
+        if equal(dist, 0):
+            return faces[index]
 
-    return [get_face(faces, l) for l in locations]
+    return [get_face(l) for l in locations]
 
 
 def create_face(bm, size, offset, xyz):
@@ -387,9 +594,66 @@ def sort_verts(verts, direction):
 
 
 def get_opposite_face(face, faces, n=1):
+    if _opposite_faces is not None:
+        opposite = _opposite_faces.find(face)
+        if opposite is not None:
+            return opposite
     return sorted([f for f in faces if f!=face], key=lambda f:(face.calc_center_bounds()-f.calc_center_bounds()).length)[0]
 
 
+class OppositeFaces:
+    """ Opposite faces found by raycasting from a face center along -face.normal
+
+        The BVHTree of bm is built on first use and rebuilt whenever the number of
+        elements in bm changes, which also drops the cached answers
+    """
+
+    def __init__(self, bm, eps=0.0001):
+        self.bm = bm
+        self.eps = eps
+        self._tree = None
+        self._state = None
+        self._cache = {}
+
+    def _refresh(self):
+        bm = self.bm
+        state = (len(bm.verts), len(bm.edges), len(bm.faces))
+        if state != self._state:
+            bm.faces.index_update()
+            bm.faces.ensure_lookup_table()
+            self._tree = BVHTree.FromBMesh(bm)
+            self._state = state
+            self._cache.clear()
+
+    def find(self, face):
+        """ Face hit behind face, None if the ray leaves the mesh
+        """
+        self._refresh()
+        if face not in self._cache:
+            normal = face.normal
+            origin = face.calc_center_bounds() - normal * self.eps
+            _, _, index, _ = self._tree.ray_cast(origin, -normal)
+            opposite = None if index is None else self.bm.faces[index]
+            self._cache[face] = opposite if opposite is not face else None
+        return self._cache[face]
+
+
+_opposite_faces = None
+
+
+@contextmanager
+def opposite_face_cache(bm):
+    """ Answer get_opposite_face from OppositeFaces of bm within the block, falling back
+        to the nearest face center when the ray hits nothing
+    """
+    global _opposite_faces
+    previous, _opposite_faces = _opposite_faces, OppositeFaces(bm)
+    try:
+        yield _opposite_faces
+    finally:
+        _opposite_faces = previous
+
+
 def get_closest_edges(edge, edges, n=1):
     c = edge.verts[0].co + edge.verts[1].co
     return sorted(edges, key=lambda e:((e.verts[0].co+e.verts[1].co)-c).length)[:n]
@@ -399,19 +663,73 @@ def rotational_sort(verts, normal, start):
     pass
 
 def get_relative_offset(f1, f2):
-    x,y,_ = local_xyz(f1)
-    d = f1.calc_center_bounds() - f2.calc_center_bounds()
+    if _face_metrics is not None:
+        x,y,_ = _face_metrics.xyz(f1)
+        d = _face_metrics.center(f1) - _face_metrics.center(f2)
+    else:
+        x,y,_ = local_xyz(f1)
+        d = f1.calc_center_bounds() - f2.calc_center_bounds()
     return -d.dot(x), -d.dot(y)
 
 def boundary_edges(faces):
-    return {e for f in faces for e in f.edges if common_faces(e, faces)<2}
+    counts = Counter(e for f in faces for e in f.edges)
+    return {e for e, count in counts.items() if count < 2}
+
 
-def common_faces(edge, faces):
-    count = 0
+def boundary_loops(faces):
+    """ Closed vert loops around the region made of faces, outer boundaries and holes
+
+        Loops follow the winding of the faces, so seen from the side the normals point
+        to, outer boundaries run anti-clockwise and holes clockwise. Returns a list of
+        (verts, ccw) pairs, where ccw is whether the loop runs anti-clockwise in xy.
+    """
+    counts = Counter(e for f in faces for e in f.edges)
+    following = {}
     for f in faces:
-        if edge in f.edges:
-            count += 1
-    return count
+        for loop in f.loops:
+            if counts[loop.edge] == 1:
+                following.setdefault(loop.vert, []).append(loop.link_loop_next.vert)
+
+    loops = []
+    for start in list(following):
+        while following[start]:
+            verts = [start]
+            v = following[start].pop()
+            while v is not start and following.get(v):
+                verts.append(v)
+                v = following[v].pop()
+            if v is start:
+                loops.append((verts, loop_area(verts) > 0))
+    return loops
+
+
+def face_islands(faces):
+    """ Split faces into groups connected through shared edges, in the order of faces
+    """
+    remaining = set(faces)
+    islands = []
+    for face in faces:
+        if face not in remaining:
+            continue
+        remaining.remove(face)
+        island, stack = [], [face]
+        while stack:
+            f = stack.pop()
+            island.append(f)
+            for e in f.edges:
+                for linked in e.link_faces:
+                    if linked in remaining:
+                        remaining.remove(linked)
+                        stack.append(linked)
+        islands.append(island)
+    return islands
+
+
+def loop_area(verts):
+    """ Signed area of the loop of verts in the xy plane, positive if anti-clockwise
+    """
+    cos = [v.co for v in verts]
+    return sum(a.x * b.y - b.x * a.y for a, b in zip(cos, cos[1:] + cos[:1])) / 2
 
 @contextmanager
 def managed_bmesh(obj):
@@ -420,7 +738,8 @@ def managed_bmesh(obj):
     bm.from_mesh(me)
     bm.faces.ensure_lookup_table()
     try:
-        yield bm
+        with edge_orientation_cache(bm), face_metrics_cache(bm):
+            yield bm
     finally:
         bm.to_mesh(me)
 
@@ -428,8 +747,10 @@ def managed_bmesh(obj):
 def managed_bmesh_edit(edit_object):
     bm = bmesh.from_edit_mesh(edit_object.data)
     bm.faces.ensure_lookup_table()
+    selected = {e for f in bm.faces if f.select for e in f.edges}
     try:
-        yield bm
+        with edge_orientation_cache(bm, selected), face_metrics_cache(bm):
+            yield bm
     finally:
         bmesh.update_edit_mesh(edit_object.data, loop_triangles=True)
 
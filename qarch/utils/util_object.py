@@ -1,6 +1,8 @@
+import os
 import bpy
 import bmesh
 from contextlib import contextmanager
+from bpy.app.handlers import persistent
 
 from .util_mesh import select, get_edit_mesh
 
@@ -59,6 +61,19 @@ def import_obj(path, name):
 def import_blend(path, linked=True):
     """ Import object exported with up=Z and forward=X
     """
+    parent_objs = load_blend(path, linked)
+
+    link_objects(parent_objs, bpy.context.object.users_collection)
+    make_parent(parent_objs, bpy.context.object)
+    for obj in parent_objs:
+        obj.select_set(False)
+
+    return parent_objs
+
+
+def load_blend(path, linked=True):
+    """ Load the objects of a .blend file as local objects, without linking them to a scene
+    """
     with bpy.data.libraries.load(path, link=linked) as (data_from, data_to):
         data_to.objects = data_from.objects
         if hasattr(data_from, "groups") and data_from.groups:
@@ -66,13 +81,10 @@ def import_blend(path, linked=True):
 
     parent_objs = [ob for ob in data_to.objects if not ob.parent]
 
-    link_objects(parent_objs, bpy.context.object.users_collection)
-    make_parent(parent_objs, bpy.context.object)
     def process_object(obj):
         for child in obj.children:
             process_object(child)
         obj.make_local()
-        obj.select_set(False)
 
     for obj in parent_objs:
         process_object(obj)
@@ -80,6 +92,161 @@ def import_blend(path, linked=True):
     return parent_objs
 
 
+def duplicate_hierarchy(obj):
+    """ Copy obj and its children, the copies sharing the mesh data of the originals
+    """
+    copy = obj.copy()
+    for child in obj.children:
+        duplicate_hierarchy(child).parent = copy
+    return copy
+
+
+class BlendCache:
+    """ Objects of .blend files loaded once per session
+
+        The first request for a file loads its objects and keeps them out of the scene as
+        sources, later requests get duplicates sharing their mesh data. Sources are kept
+        by name per (path, mtime) and looked up in bpy.data on every request, so a file
+        is loaded again when it changes on disk or its sources were removed
+    """
+
+    def __init__(self):
+        self._sources = {}
+
+    def clear(self):
+        self._sources.clear()
+
+    def sources(self, path):
+        key = (path, os.path.getmtime(path))
+        names = self._sources.get(key, ())
+        objs = [bpy.data.objects.get(name) for name in names]
+        if not objs or None in objs:
+            self._sources = {k: v for k, v in self._sources.items() if k[0] != path}
+            objs = load_blend(path)
+            self._sources[key] = [obj.name for obj in objs]
+        return objs
+
+    def import_blend(self, path):
+        """ Same as import_blend(path), without reading the file after the first call
+        """
+        parent_objs = [duplicate_hierarchy(obj) for obj in self.sources(path)]
+
+        link_objects(parent_objs, bpy.context.object.users_collection)
+        make_parent(parent_objs, bpy.context.object)
+        for obj in parent_objs:
+            obj.select_set(False)
+
+        return parent_objs
+
+    def collection(self, path):
+        """ Collection holding the objects of path, for collection instances
+
+            The collection records path and mtime in custom properties and is looked up
+            in bpy.data, so it is reused after clear(), undo or reload rather than
+            made again, until the file changes on disk
+        """
+        mtime = os.path.getmtime(path)
+        for collection in bpy.data.collections:
+            if (
+                collection.get("qarch_blend") == path
+                and collection.get("qarch_mtime") == mtime
+                and collection.objects
+            ):
+                return collection
+
+        collection = bpy.data.collections.new(os.path.splitext(os.path.basename(path))[0])
+        collection["qarch_blend"] = path
+        collection["qarch_mtime"] = mtime
+        link_hierarchy(self.sources(path), collection)
+        return collection
+
+
+def link_hierarchy(objs, collection):
+    for obj in objs:
+        collection.objects.link(obj)
+        link_hierarchy(obj.children, collection)
+
+
+def collection_instance(collection):
+    """ Empty instancing collection, linked and parented like the objects of import_blend
+    """
+    obj = bpy.data.objects.new(collection.name, None)
+    obj.instance_type = "COLLECTION"
+    obj.instance_collection = collection
+
+    link_objects([obj], bpy.context.object.users_collection)
+    make_parent([obj], bpy.context.object)
+    obj.select_set(False)
+    return obj
+
+
+blend_cache = BlendCache()
+
+
+@persistent
+def clear_blend_cache(*args):
+    """ Forget the sources of blend_cache, run from the load_post and undo_post handlers
+    """
+    blend_cache.clear()
+
+
+def cached_import_blend(path):
+    """ import_blend through blend_cache
+    """
+    return blend_cache.import_blend(path)
+
+
 def align_obj(obj, dir, track='Z', up='Y'):
     obj.rotation_mode = 'QUATERNION'
     obj.rotation_quaternion = dir.to_track_quat(track, up)
+
+
+class SharedMeshes:
+    """ Filled meshes keyed by the mesh they were filled from
+
+        Objects whose meshes start out the same, like the elements of a door or window
+        array, then link one filled mesh datablock instead of repeating the fill. Each
+        object keeps its own origin and transform. With enabled False every object is
+        filled on its own
+    """
+
+    def __init__(self, enabled=True, precision=5):
+        self.enabled = enabled
+        self.precision = precision
+        self._filled = {}
+
+    def key(self, obj):
+        me = obj.data
+        coords = tuple(round(c, self.precision) for v in me.vertices for c in v.co)
+        loops = tuple(tuple(p.vertices) for p in me.polygons)
+        return coords, loops
+
+    def fill(self, obj, fill, *args):
+        """ Call fill(obj, *args), or link obj to the mesh a previous identical object
+            was filled into
+        """
+        if not self.enabled:
+            fill(obj, *args)
+            return
+
+        # -- datablocks are kept by name, a python reference may outlive an undo
+        key = (fill, self.key(obj))
+        mesh_name, face_map_names = self._filled.get(key, (None, ()))
+        shared = bpy.data.meshes.get(mesh_name) if mesh_name else None
+        if shared is None:
+            fill(obj, *args)
+            face_map_names = ()
+            if bpy.app.version < (4, 0, 0):
+                face_map_names = tuple(face_map.name for face_map in obj.face_maps)
+            self._filled[key] = (obj.data.name, face_map_names)
+            return
+
+        unfilled = obj.data
+        obj.data = shared
+        bpy.data.meshes.remove(unfilled)
+        # -- face maps belong to the object, not to the shared mesh
+        # -- with a facemap_materials slot each, as add_facemaps keeps them in step
+        for name in face_map_names:
+            if not obj.face_maps.get(name):
+                obj.face_maps.new(name=name)
+                obj.facemap_materials.add()
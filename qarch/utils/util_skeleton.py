@@ -6,8 +6,10 @@ import heapq
 import operator
 import itertools as it
 
+from array import array
 from enum import Enum
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 
 class Vector2:
@@ -436,6 +438,13 @@ def approximately_same(point_a, point_b):
     )
 
 
+def edge_key(edge):
+    """ Hashable key under which edges with the same start point and direction match
+    """
+    norm = edge.v.normalized()
+    return (edge.p.x, edge.p.y, norm.x, norm.y)
+
+
 def normalize_contour(contour):
     contour = [Point2(float(x), float(y)) for (x, y) in contour]
     return [
@@ -452,27 +461,6 @@ class RoofType(Enum):
     GABLE_ROOF = 2
 
 
-SkeletonRoofType = RoofType.HIP_ROOF
-
-
-def set_roof_type_hip():
-    global SkeletonRoofType
-    SkeletonRoofType = RoofType.HIP_ROOF
-
-
-def set_roof_type_gable():
-    global SkeletonRoofType
-    SkeletonRoofType = RoofType.GABLE_ROOF
-
-
-def roof_is_hip():
-    return SkeletonRoofType == RoofType.HIP_ROOF
-
-
-def roof_is_gable():
-    return SkeletonRoofType == RoofType.GABLE_ROOF
-
-
 # -- Event Type (etype) is 1
 class SplitEvent(
     namedtuple("SplitEvent", "distance intersection_point etype vertex opposite_edge")
@@ -502,6 +490,158 @@ OriginalEdge = namedtuple("_OriginalEdge", "edge bisector_left, bisector_right")
 Subtree = namedtuple("Subtree", "source, height, sinks")
 
 
+class EdgeGrid:
+    """ Uniform grid over the original edges, used to find split event candidates.
+
+        A split point b found for a reflex vertex at p is as far from the line of the
+        opposite edge as from the line through p that it was constructed from, so its
+        height above the edge is at most |b - p|. Staying between the bisectors of the
+        edge keeps b within stretch * height of the segment itself. Edges can therefore
+        be visited in rings of growing distance from p, stopping once no unvisited edge
+        can beat the nearest event found so far. Each edge also keeps the three half planes
+        a split point has to satisfy, so edges the bisector ray never enters are rejected
+        without building any geometry.
+    """
+
+    # -- edges whose bisectors run almost parallel to them are always tested
+    MAX_STRETCH = 4.0
+
+    def __init__(self, original_edges):
+        xs = [c for e in original_edges for c in (e.edge.p.x, e.edge.p.x + e.edge.v.x)]
+        ys = [c for e in original_edges for c in (e.edge.p.y, e.edge.p.y + e.edge.v.y)]
+        self._min_x, self._min_y = min(xs), min(ys)
+        span = max(max(xs) - self._min_x, max(ys) - self._min_y) or 1.0
+        self._eps = span * 1e-9
+        self._count = max(1, math.ceil(math.sqrt(len(original_edges))))
+        self._size = span / self._count
+
+        self._cells = [[] for _ in range(self._count ** 2)]
+        self._everywhere = []
+        self._planes = [
+            (
+                self._halfplane(edge.bisector_left.v, edge.bisector_left.p, 1),
+                self._halfplane(edge.bisector_right.v, edge.bisector_right.p, -1),
+                self._halfplane(edge.edge.v, edge.edge.p, -1),
+            )
+            for edge in original_edges
+        ]
+        self.stretch = 1.0
+        for index, edge in enumerate(original_edges):
+            stretch = self._edge_stretch(edge)
+            if stretch is None or stretch > self.MAX_STRETCH:
+                self._everywhere.append(index)
+                continue
+            self.stretch = max(self.stretch, stretch)
+
+            p1, p2 = edge.edge.p, edge.edge.p2
+            i0, j0 = self._cell(min(p1.x, p2.x) - self._eps, min(p1.y, p2.y) - self._eps)
+            i1, j1 = self._cell(max(p1.x, p2.x) + self._eps, max(p1.y, p2.y) + self._eps)
+            for i in range(i0, i1 + 1):
+                for j in range(j0, j1 + 1):
+                    self._cells[i * self._count + j].append(index)
+
+    def _halfplane(self, v, p, sign):
+        """ (a, b, c) such that a * x + b * y + c >= 0 holds wherever sign * cross(v, q - p) > 0
+        """
+        length = abs(v)
+        a, b = -sign * v.y / length, sign * v.x / length
+        return a, b, self._eps - a * p.x - b * p.y
+
+    def reachable(self, indices, x, y, dx, dy, limit):
+        """ Those of indices for which the ray from (x, y) along (dx, dy), up to
+            distance limit, enters the region where a split point for the edge can lie
+        """
+        length = math.hypot(dx, dy)
+        ux, uy = dx / length, dy / length
+        start, end = -self._eps, limit * (1 + 1e-6) + self._eps
+        result = []
+        for index in indices:
+            t0, t1 = start, end
+            for a, b, c in self._planes[index]:
+                g0 = a * x + b * y + c
+                g1 = a * ux + b * uy
+                if g1 > 0:
+                    t0 = max(t0, -g0 / g1)
+                elif g1 < 0:
+                    t1 = min(t1, -g0 / g1)
+                elif g0 < 0:
+                    t1 = -math.inf
+            if t0 <= t1:
+                result.append(index)
+        return result
+
+    @staticmethod
+    def _edge_stretch(edge):
+        """ Bound on distance from the edge segment per unit of height above the edge line
+            for points between the bisectors of its end points, None when unbounded
+        """
+        v = edge.edge.v
+        length = abs(v)
+        n = Vector2(v.y / length, -v.x / length)  # -- side on which split points lie
+        ends = (
+            (edge.bisector_left, -v, edge.edge.p2, lambda c: c > 0),
+            (edge.bisector_right, v, edge.edge.p, lambda c: c < 0),
+        )
+        stretch = 1.0
+        for bisector, outward, other, accepts in ends:
+            # -- the wedge has to open towards the other end of the edge
+            if not accepts(cross(bisector.v, other - bisector.p)):
+                return None
+            u = bisector.v.normalized()
+            rise = u.dot(n)
+            if rise == 0:
+                return None
+            if rise < 0:
+                u, rise = -u, -rise
+            if u.dot(outward) > 0:
+                stretch = max(stretch, 1 / rise)
+        return stretch
+
+    def _cell(self, x, y):
+        i = int((x - self._min_x) // self._size)
+        j = int((y - self._min_y) // self._size)
+        return min(max(i, 0), self._count - 1), min(max(j, 0), self._count - 1)
+
+    def rings(self, x, y):
+        """ Yield (radius, indices) in order of distance from (x, y), where indices are
+            the newly reached edges and every edge closer than radius has been yielded
+        """
+        ci = math.floor((x - self._min_x) / self._size)
+        cj = math.floor((y - self._min_y) / self._size)
+        seen = set(self._everywhere)
+        batch = list(self._everywhere)
+        count = self._count
+        last = count - 1
+        k = max(0, -ci, -cj, ci - last, cj - last)
+        while True:
+            i0, i1, j0, j1 = ci - k, ci + k, cj - k, cj + k
+            # -- only the border of the square, clipped to the grid
+            rows = [i for i in {i0, i1} if 0 <= i <= last]
+            cols = [j for j in {j0, j1} if 0 <= j <= last]
+            ring = [
+                i * count + j
+                for i in range(max(i0, 0), min(i1, last) + 1)
+                for j in cols
+            ]
+            ring.extend(
+                i * count + j
+                for j in range(max(j0 + 1, 0), min(j1 - 1, last) + 1)
+                for i in rows
+            )
+            for cell in ring:
+                for index in self._cells[cell]:
+                    if index not in seen:
+                        seen.add(index)
+                        batch.append(index)
+            done = i0 <= 0 and j0 <= 0 and i1 >= last and j1 >= last
+            radius = float("inf") if done else k * self._size
+            yield radius, batch
+            if done:
+                return
+            batch = []
+            k += 1
+
+
 class LAVertex:
     def __init__(self, point, edge_left, edge_right, direction_vectors=None):
         self.point = point
@@ -521,11 +661,16 @@ class LAVertex:
         self._bisector = Ray2(
             self.point, operator.add(*creator_vectors) * (-1 if self.is_reflex else 1)
         )
+        self.edge_keys = (edge_key(edge_left), edge_key(edge_right))
 
     @property
     def bisector(self):
         return self._bisector
 
+    @property
+    def unit_bisector(self):
+        return self._bisector.v.normalized()
+
     @property
     def is_reflex(self):
         return self._is_reflex
@@ -534,80 +679,57 @@ class LAVertex:
     def original_edges(self):
         return self.lav._slav._original_edges
 
+    @property
+    def edge_grid(self):
+        return self.lav._slav._edge_grid
+
     def next_event(self):
         events = []
-        if self.is_reflex:
-            for edge in self.original_edges:
-                if edge.edge == self.edge_left or edge.edge == self.edge_right:
-                    continue
-
-                leftdot = abs(
-                    self.edge_left.v.normalized().dot(edge.edge.v.normalized())
-                )
-                rightdot = abs(
-                    self.edge_right.v.normalized().dot(edge.edge.v.normalized())
-                )
-                selfedge = self.edge_left if leftdot < rightdot else self.edge_right
-
-                i = Line2(selfedge).intersect(Line2(edge.edge))
-                if i is not None and not approximately_equals(i, self.point):
-                    # locate candidate b
-                    linvec = (self.point - i).normalized()
-                    edvec = edge.edge.v.normalized()
-                    if linvec.dot(edvec) < 0:
-                        edvec = -edvec
-
-                    bisecvec = edvec + linvec
-                    if abs(bisecvec) == 0:
-                        continue
-                    bisector = Line2(i, bisecvec)
-                    b = bisector.intersect(self.bisector)
-
-                    if b is None:
-                        continue
-
-                    xleft = (
-                        cross(
-                            edge.bisector_left.v.normalized(),
-                            (b - edge.bisector_left.p).normalized(),
-                        )
-                        > 0
-                    )
-                    xright = (
-                        cross(
-                            edge.bisector_right.v.normalized(),
-                            (b - edge.bisector_right.p).normalized(),
-                        )
-                        < 0
-                    )
-                    xedge = (
-                        cross(edge.edge.v.normalized(), (b - edge.edge.p).normalized())
-                        < 0
-                    )
-
-                    if not (xleft and xright and xedge):
-                        continue
-
-                    events.append(
-                        SplitEvent(Line2(edge.edge).distance(b), b, 0, self, edge.edge)
-                    )
+        edge_events = []
 
         i_prev = self.bisector.intersect(self.prev.bisector)
         i_next = self.bisector.intersect(self.next.bisector)
 
         if i_prev is not None:
-            events.append(
+            edge_events.append(
                 EdgeEvent(
                     Line2(self.edge_left).distance(i_prev), i_prev, 1, self.prev, self
                 )
             )
         if i_next is not None:
-            events.append(
+            edge_events.append(
                 EdgeEvent(
                     Line2(self.edge_right).distance(i_next), i_next, 1, self, self.next
                 )
             )
 
+        if self.is_reflex:
+            # -- visit edges nearest first, until none left can beat the closest event
+            grid = self.edge_grid
+            nearest = min(
+                (self.point.distance(e.intersection_point) for e in edge_events),
+                default=float("inf"),
+            )
+            split_events = []
+            point, direction = self.point, self.bisector.v
+            for radius, indices in grid.rings(point.x, point.y):
+                for index in grid.reachable(
+                    indices, point.x, point.y, direction.x, direction.y, nearest
+                ):
+                    event = self._split_event(self.original_edges[index])
+                    if event is not None:
+                        split_events.append((index, event))
+                        nearest = min(
+                            nearest, self.point.distance(event.intersection_point)
+                        )
+                if nearest * (grid.stretch + 1) * (1 + 1e-6) < radius:
+                    break
+            # -- keep original edge order, ties are resolved by position in events
+            split_events.sort(key=lambda ie: ie[0])
+            events.extend(event for _, event in split_events)
+
+        events.extend(edge_events)
+
         if not events:
             return None
 
@@ -617,6 +739,56 @@ class LAVertex:
 
         return ev
 
+    def _split_event(self, edge):
+        """ Split event of this reflex vertex against original edge, if any
+        """
+        if edge.edge == self.edge_left or edge.edge == self.edge_right:
+            return None
+
+        leftdot = abs(self.edge_left.v.normalized().dot(edge.edge.v.normalized()))
+        rightdot = abs(self.edge_right.v.normalized().dot(edge.edge.v.normalized()))
+        selfedge = self.edge_left if leftdot < rightdot else self.edge_right
+
+        i = Line2(selfedge).intersect(Line2(edge.edge))
+        if i is None or approximately_equals(i, self.point):
+            return None
+
+        # locate candidate b
+        linvec = (self.point - i).normalized()
+        edvec = edge.edge.v.normalized()
+        if linvec.dot(edvec) < 0:
+            edvec = -edvec
+
+        bisecvec = edvec + linvec
+        if abs(bisecvec) == 0:
+            return None
+        bisector = Line2(i, bisecvec)
+        b = bisector.intersect(self.bisector)
+
+        if b is None:
+            return None
+
+        xleft = (
+            cross(
+                edge.bisector_left.v.normalized(),
+                (b - edge.bisector_left.p).normalized(),
+            )
+            > 0
+        )
+        xright = (
+            cross(
+                edge.bisector_right.v.normalized(),
+                (b - edge.bisector_right.p).normalized(),
+            )
+            < 0
+        )
+        xedge = cross(edge.edge.v.normalized(), (b - edge.edge.p).normalized()) < 0
+
+        if not (xleft and xright and xedge):
+            return None
+
+        return SplitEvent(Line2(edge.edge).distance(b), b, 0, self, edge.edge)
+
     def invalidate(self):
         if self.lav is not None:
             self.lav.invalidate(self)
@@ -646,10 +818,13 @@ class LAVertex:
 
 
 class SLAV:
-    def __init__(self, polygon, holes):
+    def __init__(self, polygon, holes, mode=RoofType.HIP_ROOF):
+        self._mode = mode
         contours = [normalize_contour(polygon)]
         contours.extend([normalize_contour(hole) for hole in holes])
 
+        # live vertices keyed by the edges they reference, see edge_key
+        self._edge_vertices = {}
         self._lavs = [LAV.from_polygon(contour, self) for contour in contours]
 
         # store original polygon edges for calculating split events
@@ -661,6 +836,14 @@ class SLAV:
             )
             for vertex in it.chain.from_iterable(self._lavs)
         ]
+        self._index_original_edges()
+
+    def _index_original_edges(self):
+        self._edge_grid = EdgeGrid(self._original_edges)
+        # -- end points of the footprint edges, for gable processing
+        self._original_points = set()
+        for e in self._original_edges:
+            self._original_points.update((e.edge.p1, e.edge.p2))
 
     def __iter__(self):
         for lav in self._lavs:
@@ -672,6 +855,22 @@ class SLAV:
     def empty(self):
         return len(self._lavs) == 0
 
+    def index_vertex(self, vertex):
+        for key in vertex.edge_keys:
+            self._edge_vertices.setdefault(key, {})[vertex] = None
+
+    def unindex_vertex(self, vertex):
+        for key in vertex.edge_keys:
+            self._edge_vertices.get(key, {}).pop(vertex, None)
+
+    def vertices_on_edge(self, edge):
+        """ Live vertices whose left or right edge matches edge
+        """
+        return list(self._edge_vertices.get(edge_key(edge), ()))
+
+    def new_vertex(self, point, edge_left, edge_right, direction_vectors=None):
+        return LAVertex(point, edge_left, edge_right, direction_vectors)
+
     def handle_edge_event(self, event):
         sinks = []
         events = []
@@ -694,13 +893,9 @@ class SLAV:
                 events.append(next_event)
 
         # -- gable roof processing
-        if roof_is_gable():
-            original_points = []
-            for e in self._original_edges:
-                original_points.extend([e.edge.p1, e.edge.p2])
-
+        if self._mode == RoofType.GABLE_ROOF:
             len_sinks = len(sinks)
-            set_diff = set(sinks) - set(original_points)
+            set_diff = set(sinks) - self._original_points
             len_diff = len(list(set_diff))
 
             midpoint = event.intersection_point
@@ -721,52 +916,15 @@ class SLAV:
 
         sinks = [event.vertex.point]
         vertices = []
-        x = None  # right vertex
-        y = None  # left vertex
-        norm = event.opposite_edge.v.normalized()
-        for v in it.chain.from_iterable(self._lavs):
-            if (
-                norm == v.edge_left.v.normalized()
-                and event.opposite_edge.p == v.edge_left.p
-            ):
-                x = v
-                y = x.prev
-            elif (
-                norm == v.edge_right.v.normalized()
-                and event.opposite_edge.p == v.edge_right.p
-            ):
-                y = v
-                x = y.next
-
-            if x:
-                xleft = (
-                    cross(
-                        y.bisector.v.normalized(),
-                        (event.intersection_point - y.point).normalized(),
-                    )
-                    >= 0
-                )
-                xright = (
-                    cross(
-                        x.bisector.v.normalized(),
-                        (event.intersection_point - x.point).normalized(),
-                    )
-                    <= 0
-                )
-
-                if xleft and xright:
-                    break
-                else:
-                    x = None
-                    y = None
-
-        if x is None:
+        match = self._opposite_vertices(event)
+        if match is None:
             return (None, [])
+        x, y = match
 
-        v1 = LAVertex(
+        v1 = self.new_vertex(
             event.intersection_point, event.vertex.edge_left, event.opposite_edge
         )
-        v2 = LAVertex(
+        v2 = self.new_vertex(
             event.intersection_point, event.opposite_edge, event.vertex.edge_right
         )
 
@@ -807,6 +965,50 @@ class SLAV:
         event.vertex.invalidate()
         return (Subtree(event.intersection_point, event.distance, sinks), events)
 
+    def _opposite_vertices(self, event):
+        """ The (x, y) pair of live vertices bounding the part of the opposite edge
+            that event splits, or None
+        """
+        key = edge_key(event.opposite_edge)
+        matches = []
+        for v in self.vertices_on_edge(event.opposite_edge):
+            if v.edge_keys[0] == key:
+                x = v  # right vertex
+                y = x.prev  # left vertex
+            else:
+                y = v
+                x = y.next
+
+            xleft = (
+                cross(
+                    y.bisector.v.normalized(),
+                    (event.intersection_point - y.point).normalized(),
+                )
+                >= 0
+            )
+            xright = (
+                cross(
+                    x.bisector.v.normalized(),
+                    (event.intersection_point - x.point).normalized(),
+                )
+                <= 0
+            )
+
+            if xleft and xright:
+                matches.append((v, x, y))
+        return self._first_match(matches)
+
+    def _first_match(self, matches):
+        if not matches:
+            return None
+
+        if len(matches) > 1:
+            # -- pick the match that comes first in lav order
+            order = {v: i for i, v in enumerate(it.chain.from_iterable(self._lavs))}
+            matches.sort(key=lambda match: order[match[0]])
+        _, x, y = matches[0]
+        return x, y
+
 
 class LAV:
     def __init__(self, slav):
@@ -823,6 +1025,7 @@ class LAV:
                 point, LineSegment2(prev, point), LineSegment2(point, next)
             )
             vertex.lav = lav
+            slav.index_vertex(vertex)
             if lav.head is None:
                 lav.head = vertex
                 vertex.prev = vertex.next = vertex
@@ -840,6 +1043,7 @@ class LAV:
         for vertex in lav:
             lav._len += 1
             vertex.lav = lav
+            slav.index_vertex(vertex)
         return lav
 
     def invalidate(self, vertex):
@@ -848,15 +1052,17 @@ class LAV:
         if self.head == vertex:
             self.head = self.head.next
         vertex.lav = None
+        self._slav.unindex_vertex(vertex)
 
     def unify(self, vertex_a, vertex_b, point):
-        replacement = LAVertex(
+        replacement = self._slav.new_vertex(
             point,
             vertex_a.edge_left,
             vertex_b.edge_right,
-            (vertex_b.bisector.v.normalized(), vertex_a.bisector.v.normalized()),
+            (vertex_b.unit_bisector, vertex_a.unit_bisector),
         )
         replacement.lav = self
+        self._slav.index_vertex(replacement)
 
         if self.head in [vertex_a, vertex_b]:
             self.head = replacement
@@ -898,6 +1104,338 @@ class LAV:
                 break
 
 
+def _unit(x, y):
+    """ Float version of Vector2.normalized
+    """
+    d = math.sqrt(x ** 2 + y ** 2)
+    if d:
+        return x / d, y / d
+    return x, y
+
+
+def _intersect_xy(ax, ay, adx, ady, a_ray, bx, by, bdx, bdy, b_ray):
+    """ Float version of _intersect_line2_line2, a_ray/b_ray mark rays, otherwise lines
+    """
+    d = bdy * adx - bdx * ady
+    if d == 0:
+        return None
+
+    dy = ay - by
+    dx = ax - bx
+    ua = (bdx * dy - bdy * dx) / d
+    if a_ray and not ua >= 0.0:
+        return None
+    ub = (adx * dy - ady * dx) / d
+    if b_ray and not ub >= 0.0:
+        return None
+
+    return ax + ua * adx, ay + ua * ady
+
+
+class EdgeArrays:
+    """ Original edges of a SLAV packed into flat float arrays
+
+        Edge i runs from the contour point before point i to point i. The
+        bisectors are those of the original vertices at either end.
+    """
+
+    def __init__(self, points, prev_index):
+        size = len(points)
+        zeros = array("d", [0.0]) * size
+        self.x, self.y = array("d", zeros), array("d", zeros)
+        self.vx, self.vy = array("d", zeros), array("d", zeros)
+        self.ux, self.uy = array("d", zeros), array("d", zeros)
+        self.left_x, self.left_y = array("d", zeros), array("d", zeros)
+        self.left_ux, self.left_uy = array("d", zeros), array("d", zeros)
+        self.right_x, self.right_y = array("d", zeros), array("d", zeros)
+        self.right_ux, self.right_uy = array("d", zeros), array("d", zeros)
+
+        self.key = []
+        canonical = {}
+        for index, point in enumerate(points):
+            prev = points[prev_index[index]]
+            vx, vy = point.x - prev.x, point.y - prev.y
+            ux, uy = _unit(vx, vy)
+            self.x[index], self.y[index] = prev.x, prev.y
+            self.vx[index], self.vy[index] = vx, vy
+            self.ux[index], self.uy[index] = ux, uy
+            # -- same matching rule as edge_key, by index of the first such edge
+            self.key.append(canonical.setdefault((prev.x, prev.y, ux, uy), index))
+
+    def set_bisectors(self, index, left, right):
+        self.left_x[index], self.left_y[index] = left._bx, left._by
+        self.left_ux[index], self.left_uy[index] = left.unit_bisector
+        self.right_x[index], self.right_y[index] = right._bx, right._by
+        self.right_ux[index], self.right_uy[index] = right.unit_bisector
+
+    def distance(self, index, x, y):
+        """ Float version of Line2(edge).distance(Point2(x, y))
+        """
+        ex, ey = self.x[index], self.y[index]
+        vx, vy = self.vx[index], self.vy[index]
+        u = ((x - ex) * vx + (y - ey) * vy) / (vx ** 2 + vy ** 2)
+        return math.sqrt((ex + u * vx - x) ** 2 + (ey + u * vy - y) ** 2)
+
+
+class ArrayVertex(LAVertex):
+    """ LAVertex working on plain floats and EdgeArrays
+
+        Edges are referenced by index into the arrays. An index i stands for the
+        original edge itself, ~i for an equal copy of it, so identity checks
+        against original edges behave as in LAVertex.
+    """
+
+    def __init__(self, edges, point, edge_left, edge_right, direction_vectors=None):
+        self.point = point
+        self.edge_left = edge_left
+        self.edge_right = edge_right
+        self.prev = None
+        self.next = None
+        self.lav = None
+        self._valid = True
+
+        self._edges = edges
+        self._left = left = edge_left if edge_left >= 0 else ~edge_left
+        self._right = right = edge_right if edge_right >= 0 else ~edge_right
+        ax, ay = edges.ux[left] * -1, edges.uy[left] * -1
+        bx, by = edges.ux[right], edges.uy[right]
+        if direction_vectors is None:
+            (dax, day), (dbx, dby) = (ax, ay), (bx, by)
+        else:
+            (dax, day), (dbx, dby) = direction_vectors
+
+        self._is_reflex = (dax * dby - dbx * day) < 0
+        sign = -1 if self._is_reflex else 1
+        self._bx, self._by = point.x, point.y
+        self._bdx, self._bdy = (ax + bx) * sign, (ay + by) * sign
+        self._unit_bisector = _unit(self._bdx, self._bdy)
+        self.edge_keys = (edges.key[left], edges.key[right])
+
+    @property
+    def bisector(self):
+        return Ray2(Point2(self._bx, self._by), Vector2(self._bdx, self._bdy))
+
+    @property
+    def unit_bisector(self):
+        return self._unit_bisector
+
+    def _meet(self, other):
+        """ Intersection of the bisector of other with this one, as in
+            self.bisector.intersect(other.bisector)
+        """
+        return _intersect_xy(
+            other._bx,
+            other._by,
+            other._bdx,
+            other._bdy,
+            True,
+            self._bx,
+            self._by,
+            self._bdx,
+            self._bdy,
+            True,
+        )
+
+    def next_event(self):
+        edges = self._edges
+        px, py = self.point.x, self.point.y
+        # -- (point distance, event distance, x, y, make event)
+        edge_events = []
+
+        i_prev = self._meet(self.prev)
+        i_next = self._meet(self.next)
+
+        if i_prev is not None:
+            x, y = i_prev
+            edge_events.append(
+                (
+                    math.sqrt((x - px) ** 2 + (y - py) ** 2),
+                    edges.distance(self._left, x, y),
+                    x,
+                    y,
+                    lambda d, p: EdgeEvent(d, p, 1, self.prev, self),
+                )
+            )
+        if i_next is not None:
+            x, y = i_next
+            edge_events.append(
+                (
+                    math.sqrt((x - px) ** 2 + (y - py) ** 2),
+                    edges.distance(self._right, x, y),
+                    x,
+                    y,
+                    lambda d, p: EdgeEvent(d, p, 1, self, self.next),
+                )
+            )
+
+        events = []
+        if self.is_reflex:
+            # -- visit edges nearest first, until none left can beat the closest event
+            grid = self.edge_grid
+            nearest = min((e[0] for e in edge_events), default=float("inf"))
+            split_events = []
+            for radius, indices in grid.rings(px, py):
+                for index in grid.reachable(
+                    indices, px, py, self._bdx, self._bdy, nearest
+                ):
+                    event = self._split_event(index, px, py)
+                    if event is not None:
+                        split_events.append((index, event))
+                        nearest = min(nearest, event[0])
+                if nearest * (grid.stretch + 1) * (1 + 1e-6) < radius:
+                    break
+            split_events.sort(key=lambda ie: ie[0])
+            events.extend(event for _, event in split_events)
+
+        events.extend(edge_events)
+
+        if not events:
+            return None
+
+        best = events[0]
+        for event in events:
+            if event[0] < best[0]:
+                best = event
+        _, distance, x, y, make = best
+        return make(distance, Point2(x, y))
+
+    def _split_event(self, index, px, py):
+        """ Split event candidate of this reflex vertex against original edge at
+            index, as in LAVertex._split_event
+        """
+        if index == self.edge_left or index == self.edge_right:
+            return None
+
+        e = self._edges
+        ux, uy = e.ux[index], e.uy[index]
+        left, right = self._left, self._right
+        leftdot = abs(e.ux[left] * ux + e.uy[left] * uy)
+        rightdot = abs(e.ux[right] * ux + e.uy[right] * uy)
+        own = left if leftdot < rightdot else right
+
+        i = _intersect_xy(
+            e.x[index],
+            e.y[index],
+            e.vx[index],
+            e.vy[index],
+            False,
+            e.x[own],
+            e.y[own],
+            e.vx[own],
+            e.vy[own],
+            False,
+        )
+        if i is None:
+            return None
+        ix, iy = i
+        gap = math.sqrt((ix - px) ** 2 + (iy - py) ** 2)
+        scale = max(math.sqrt(ix ** 2 + iy ** 2), math.sqrt(px ** 2 + py ** 2))
+        if (ix == px and iy == py) or gap <= scale * 0.001:
+            return None
+
+        # locate candidate b
+        lx, ly = _unit(px - ix, py - iy)
+        if lx * ux + ly * uy < 0:
+            ux, uy = -ux, -uy
+
+        dx, dy = ux + lx, uy + ly
+        if math.sqrt(dx ** 2 + dy ** 2) == 0:
+            return None
+        b = _intersect_xy(
+            self._bx, self._by, self._bdx, self._bdy, True, ix, iy, dx, dy, False
+        )
+        if b is None:
+            return None
+        bx, by = b
+
+        cx, cy = _unit(bx - e.left_x[index], by - e.left_y[index])
+        if not e.left_ux[index] * cy - cx * e.left_uy[index] > 0:
+            return None
+        cx, cy = _unit(bx - e.right_x[index], by - e.right_y[index])
+        if not e.right_ux[index] * cy - cx * e.right_uy[index] < 0:
+            return None
+        cx, cy = _unit(bx - e.x[index], by - e.y[index])
+        if not e.ux[index] * cy - cx * e.uy[index] < 0:
+            return None
+
+        return (
+            math.sqrt((bx - px) ** 2 + (by - py) ** 2),
+            e.distance(index, bx, by),
+            bx,
+            by,
+            lambda d, p: SplitEvent(d, p, 0, self, index),
+        )
+
+
+class ArraySLAV(SLAV):
+    """ SLAV built from ArrayVertex, gives the same skeleton as SLAV
+    """
+
+    def __init__(self, polygon, holes, mode=RoofType.HIP_ROOF):
+        self._mode = mode
+        contours = [normalize_contour(polygon)]
+        contours.extend([normalize_contour(hole) for hole in holes])
+
+        points, prev_index = [], []
+        for contour in contours:
+            start, count = len(points), len(contour)
+            points.extend(contour)
+            prev_index.extend(start + (i - 1) % count for i in range(count))
+        self._edges = EdgeArrays(points, prev_index)
+
+        self._edge_vertices = {}
+        self._lavs = []
+        vertices = []
+        for contour in contours:
+            start, count = len(vertices), len(contour)
+            for i in range(start, start + count):
+                following = start + (i - start + 1) % count
+                vertices.append(self.new_vertex(points[i], ~i, ~following))
+            for i in range(start, start + count):
+                vertices[i].prev = vertices[prev_index[i]]
+                vertices[prev_index[i]].next = vertices[i]
+            if count:
+                self._lavs.append(LAV.from_chain(vertices[start], self))
+
+        self._original_edges = []
+        for index, vertex in enumerate(vertices):
+            self._edges.set_bisectors(index, vertex.prev, vertex)
+            self._original_edges.append(
+                OriginalEdge(
+                    LineSegment2(vertex.prev.point, vertex.point),
+                    vertex.prev.bisector,
+                    vertex.bisector,
+                )
+            )
+        self._index_original_edges()
+
+    def new_vertex(self, point, edge_left, edge_right, direction_vectors=None):
+        return ArrayVertex(self._edges, point, edge_left, edge_right, direction_vectors)
+
+    def _opposite_vertices(self, event):
+        ix, iy = event.intersection_point.x, event.intersection_point.y
+        key = self._edges.key[event.opposite_edge]
+        matches = []
+        for v in list(self._edge_vertices.get(key, ())):
+            if v.edge_keys[0] == key:
+                x = v  # right vertex
+                y = x.prev  # left vertex
+            else:
+                y = v
+                x = y.next
+
+            ux, uy = y.unit_bisector
+            cx, cy = _unit(ix - y.point.x, iy - y.point.y)
+            xleft = ux * cy - cx * uy >= 0
+            ux, uy = x.unit_bisector
+            cx, cy = _unit(ix - x.point.x, iy - x.point.y)
+            xright = ux * cy - cx * uy <= 0
+
+            if xleft and xright:
+                matches.append((v, x, y))
+        return self._first_match(matches)
+
+
 class EventQueue:
     def __init__(self):
         self.__data = []
@@ -924,7 +1462,10 @@ class EventQueue:
             print(item)
 
 
-def skeletonize(polygon, holes=None):
+SKELETON_ENGINES = {"object": SLAV, "array": ArraySLAV}
+
+
+def skeletonize(polygon, holes=None, mode=RoofType.HIP_ROOF, engine="object"):
     """
     Compute the straight skeleton of a polygon.
 
@@ -933,8 +1474,12 @@ def skeletonize(polygon, holes=None):
 
     Returns the straight skeleton as a list of "subtrees", which are in the form of (source, height, sinks),
     where source is the highest points, height is its height, and sinks are the point connected to the source.
+
+    Mode is the RoofType, gable roofs pull ridge ends onto the midpoints of gable edges.
+    Engine picks the implementation, see SKELETON_ENGINES. "array" runs on plain floats
+    and gives the same result as the default "object" engine, only faster.
     """
-    slav = SLAV(polygon, holes)
+    slav = SKELETON_ENGINES[engine](polygon, holes or [], mode)
     output = []
     prioque = EventQueue()
 
@@ -961,3 +1506,134 @@ def skeletonize(polygon, holes=None):
             output.append(arc)
 
     return output
+
+
+class SkeletonCache:
+    """ Least recently used store of skeletonize results
+
+        Footprints are keyed by their normalized contour, rounded to precision decimals
+        and started at its lowest point, so a footprint hits the cache whichever vertex
+        it is walked from. Heights are kept as computed, callers scale them. Results
+        are shared between hits and must not be modified.
+    """
+
+    def __init__(self, maxsize=256, precision=6):
+        self.maxsize = maxsize
+        self.precision = precision
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+
+    def __len__(self):
+        return len(self._results)
+
+    def key(self, polygon, holes, mode):
+        holes = tuple(sorted(self._contour_key(hole) for hole in holes))
+        return (self._contour_key(polygon), holes, mode)
+
+    def _contour_key(self, contour):
+        points = [
+            (round(p.x, self.precision), round(p.y, self.precision))
+            for p in normalize_contour(contour)
+        ]
+        if not points:
+            return ()
+        start = points.index(min(points))
+        return tuple(points[start:] + points[:start])
+
+    def skeletonize(
+        self, polygon, holes=None, mode=RoofType.HIP_ROOF, engine="object"
+    ):
+        holes = holes or []
+        key = self.key(polygon, holes, mode)
+        result = self._results.get(key)
+        if result is None:
+            self.misses += 1
+            result = skeletonize(polygon, holes, mode, engine)
+            self._store(key, result)
+        else:
+            self.hits += 1
+            self._results.move_to_end(key)
+        return list(result)
+
+    def skeletonize_many(
+        self, polygons, mode=RoofType.HIP_ROOF, workers=4, holes=None, engine="array"
+    ):
+        """ skeletonize_many that only computes the polygons missing from the cache,
+            each distinct footprint once
+        """
+        holes = holes or [[] for _ in polygons]
+        keys = [self.key(polygon, hole, mode) for polygon, hole in zip(polygons, holes)]
+        results = {}
+        missing = OrderedDict()
+        for key, polygon, hole in zip(keys, polygons, holes):
+            if key in self._results:
+                results[key] = self._results[key]
+                self._results.move_to_end(key)
+            elif key not in missing:
+                missing[key] = (polygon, hole)
+
+        computed = skeletonize_many(
+            [polygon for polygon, _ in missing.values()],
+            mode,
+            workers,
+            [hole for _, hole in missing.values()],
+            engine,
+        )
+        for key, result in zip(missing, computed):
+            self._store(key, result)
+            results[key] = result
+
+        self.misses += len(missing)
+        self.hits += len(keys) - len(missing)
+        return [list(results[key]) for key in keys]
+
+    def _store(self, key, result):
+        self._results[key] = result
+        while len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+
+    def clear(self):
+        self._results.clear()
+        self.hits = self.misses = 0
+
+
+skeleton_cache = SkeletonCache()
+
+
+def cached_skeletonize(polygon, holes=None, mode=RoofType.HIP_ROOF, engine="object"):
+    """ skeletonize through the shared skeleton_cache
+    """
+    return skeleton_cache.skeletonize(polygon, holes, mode, engine)
+
+
+def cached_skeletonize_many(
+    polygons, mode=RoofType.HIP_ROOF, workers=4, holes=None, engine="array"
+):
+    """ skeletonize_many through the shared skeleton_cache
+    """
+    return skeleton_cache.skeletonize_many(polygons, mode, workers, holes, engine)
+
+
+def skeletonize_many(
+    polygons, mode=RoofType.HIP_ROOF, workers=4, holes=None, engine="array"
+):
+    """ Skeletons of many independent polygons, computed in a pool of workers threads
+
+        Holes, if given, holds the list of holes of each polygon. Results come back in
+        the order of polygons. Every skeleton only uses its own SLAV, so the runs do not
+        share any state.
+    """
+    holes = holes or [[] for _ in polygons]
+    if workers <= 1 or len(polygons) < 2:
+        return [
+            skeletonize(polygon, hole, mode, engine)
+            for polygon, hole in zip(polygons, holes)
+        ]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(skeletonize, polygon, hole, mode, engine)
+            for polygon, hole in zip(polygons, holes)
+        ]
+        return [future.result() for future in futures]